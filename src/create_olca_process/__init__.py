@@ -1,6 +1,8 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
+from src.create_olca_process.build_flow_index import FlowIndex
+from src.create_olca_process.build_flow_index import build_flow_index
 from src.create_olca_process.create_exchange_database import create_exchange_database
 from src.create_olca_process.create_exchange_elementary_flow import create_exchange_elementary_flow
 from src.create_olca_process.create_exchange_pr_wa_flow import create_exchange_pr_wa_flow
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# _client_cache.py
+#
+###############################################################################
+# DEPENDENCIES
+###############################################################################
+import functools
+import os
+from typing import Callable, Optional, List
+
+from netlolca import NetlOlca
+
+
+###############################################################################
+# DOCUMENTATION
+###############################################################################
+__doc__ = """
+Helper functions shared by the interactive search modules
+(search_flows_and_providers.py and search_flows_only.py).
+
+The IPC connection made when no client is provided is kept for the session,
+so searches that are run without a client connect to openLCA only once.
+
+Set the environment variable ``LCA_PROMMIS_AUTOSELECT_SINGLE=1`` to have
+selection menus with a single option select it without prompting.
+"""
+__all__ = [
+    "_ensure_client",
+    "_prompt",
+    "_prompt_select",
+]
+
+
+###############################################################################
+# GLOBALS
+###############################################################################
+_QUIT = frozenset({"q", "quit", "exit"})
+'''frozenset : Answers that leave a selection menu.'''
+
+
+###############################################################################
+# FUNCTIONS
+###############################################################################
+@functools.lru_cache(maxsize=1)
+def _connect():
+    """Return a NetlOlca instance connected to the IPC service.
+
+    The instance is cached, so later calls reuse the same connection.
+    """
+    netl = NetlOlca()
+    netl.connect()  # uses default port from NetlOlca
+    if not getattr(netl, "client", None):
+        # Raising here also keeps the failed connection out of the cache
+        raise RuntimeError(
+            "Failed to connect to openLCA via IPC. Is openLCA running with "
+            "a database open?"
+        )
+    return netl
+
+
+def _ensure_client(existing_client=None):
+    """Return a connected client. Use the provided one if valid, else
+    connect via NetlOlca (once per session)."""
+    if existing_client is not None:
+        return existing_client
+    return _connect()
+
+
+def _prompt(message):
+    """Print a prompt and return a line of user input (without the
+    trailing newline).
+
+    The built-in input is always used, so front ends that replace it (e.g.,
+    a Jupyter kernel, whose standard input is not a terminal) receive every
+    prompt; when standard input is not interactive, input reads it directly.
+    """
+    return input(message)
+
+
+def _prompt_select(rows: List[dict],
+                   display_keys: List[str],
+                   uuid_key: str,
+                   prompt: str,
+                   choose: Optional[Callable] = None,
+                   page_size: Optional[int] = 25) -> Optional[str]:
+    """Simple CLI selector over a list of dictionaries.
+
+    Parameters
+    ----------
+    rows : list
+        A list of dicts to display.
+    display_keys : list
+        A list of keys to show in each row.
+    uuid_key : str
+        A key that contains the UUID to return.
+    prompt : str
+        Input prompt string.
+    choose : callable, optional
+        A function called as ``choose(rows, prompt)`` that returns the
+        zero-based index of the selected row, or None to abort. When given,
+        the menu is not printed and no input is read. Defaults to none.
+        Otherwise, when there is only one row and the environment variable
+        ``LCA_PROMMIS_AUTOSELECT_SINGLE`` is '1', that row is selected
+        without prompting.
+    page_size : int, optional
+        The number of rows shown per page; 'n' and 'p' show the next and
+        previous pages, and any row number can be entered from any page.
+        Use None to show all rows at once. Defaults to 25.
+
+    Returns
+    -------
+    str, NoneType
+        The selected UUID string, or None if user aborts.
+
+    Raises
+    ------
+    ValueError
+        The index returned by ``choose`` is out of range.
+    """
+    if not rows:
+        print("No options to select from.")
+        return None
+
+    if choose is not None:
+        idx = choose(rows, prompt)
+        if idx is None:
+            return None
+        if not (0 <= idx < len(rows)):
+            raise ValueError(
+                f"Selected index {idx} is out of range for {len(rows)} rows."
+            )
+        return rows[idx].get(uuid_key)
+
+    n_rows = len(rows)
+    if n_rows == 1 and os.environ.get("LCA_PROMMIS_AUTOSELECT_SINGLE") == "1":
+        print("Selected the only option: " + " | ".join(
+            f"{k}: {rows[0].get(k, '')}" for k in display_keys
+        ))
+        return rows[0].get(uuid_key)
+
+    if not page_size or page_size >= n_rows:
+        page_size = n_rows
+    n_pages = -(-n_rows // page_size)
+
+    # Build the row format once; rows are only formatted once their page is
+    # shown, and each page is printed with one call
+    fmt = "{:3d}. " + " | ".join(f"{k}: {{}}" for k in display_keys)
+    lines = []
+
+    def _show_page(page):
+        start = page * page_size
+        stop = min(start + page_size, n_rows)
+        lines.extend(
+            fmt.format(i, *(rows[i - 1].get(k, "") for k in display_keys))
+            for i in range(len(lines) + 1, stop + 1)
+        )
+        text = "\n".join(lines[start:stop])
+        if n_pages > 1:
+            text += f"\nPage {page + 1} of {n_pages}"
+        print(text)
+
+    page = 0
+    _show_page(page)
+
+    # The prompt and messages do not change between retries
+    if n_pages > 1:
+        prompt_text = (
+            f"{prompt} (1-{n_rows}, 'n'/'p' for next/previous page, "
+            "or 'q' to quit): "
+        )
+    else:
+        prompt_text = f"{prompt} (1-{n_rows} or 'q' to quit): "
+    range_text = f"Please enter a number between 1 and {n_rows}."
+    while True:
+        choice = _prompt(prompt_text).strip()
+        if choice.lower() in _QUIT:
+            return None
+        if n_pages > 1 and choice.lower() in ("n", "p"):
+            page = (page + (1 if choice.lower() == "n" else -1)) % n_pages
+            _show_page(page)
+            continue
+        # isdecimal accepts exactly the digits that int() parses (isdigit
+        # also accepts, e.g., superscripts), so int() cannot raise here
+        if not choice.isdecimal():
+            print("Please enter a valid number.")
+            continue
+        idx = int(choice)
+        if not (1 <= idx <= n_rows):
+            print(range_text)
+            continue
+        return rows[idx - 1].get(uuid_key)
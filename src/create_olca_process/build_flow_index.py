@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# build_flow_index.py
+#
+###############################################################################
+# DEPENDENCIES
+###############################################################################
+import pandas as pd
+
+
+###############################################################################
+# DOCUMENTATION
+###############################################################################
+__doc__ = """
+This module has a function to build an inverted index that maps each flow
+universally unique identifier (UUID) to the processes that have it as an
+output exchange.
+
+**Assumptions**
+
+-   The user has already run the create_exchange_database.py script to create a
+    data frame with all exchanges that are outputs and their respective
+    process uuid.
+
+**Logic**
+
+Searching the exchange data frame for one flow scans every row. The index is
+built once (e.g., right after the database is imported) by grouping the
+exchange data frame by flow UUID. Only the row positions of each group are
+kept; the rows for a flow are sliced from the data frame when
+:func:`find_processes_by_flow` asks for them.
+"""
+__all__ = [
+    "FlowIndex",
+    "build_flow_index",
+]
+
+
+###############################################################################
+# CLASSES
+###############################################################################
+class FlowIndex(object):
+    """Row positions of an exchange data frame, grouped by flow UUID.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        A data frame of exchange flows (see create_exchange_database).
+    positions : dict
+        A dictionary where keys are flow UUIDs and values are arrays of row
+        positions in ``df``.
+    """
+    __slots__ = ("df", "positions")
+
+    def __init__(self, df, positions):
+        self.df = df
+        self.positions = positions
+
+    def __contains__(self, flow_uuid):
+        return flow_uuid in self.positions
+
+    def __len__(self):
+        return len(self.positions)
+
+    def get(self, flow_uuid):
+        """Return the rows of the exchange data frame for one flow.
+
+        Parameters
+        ----------
+        flow_uuid : str
+            The universally unique identifier for a flow.
+
+        Returns
+        -------
+        pandas.DataFrame
+            The rows with the flow UUID (empty if there are none).
+        """
+        rows = self.positions.get(flow_uuid)
+        if rows is None:
+            return self.df.iloc[:0]
+        return self.df.iloc[rows].reset_index(drop=True)
+
+
+###############################################################################
+# FUNCTIONS
+###############################################################################
+def build_flow_index(exchanges_df):
+    """Group an exchange data frame by flow UUID.
+
+    Parameters
+    ----------
+    exchanges_df : pandas.DataFrame
+        A data frame of exchange flows (see create_exchange_database), with
+        columns 'process_uuid', 'exchange_uuid', and 'process_name'.
+
+    Returns
+    -------
+    FlowIndex
+        The exchange data frame and the row positions of each flow UUID.
+    """
+    df = pd.DataFrame(exchanges_df)
+    if df.empty:
+        return FlowIndex(df, {})
+
+    # Only group on observed values; with a categorical column, pandas
+    # would otherwise also create an empty group for every category.
+    positions = df.groupby(
+        'exchange_uuid', sort=False, observed=True
+    ).indices
+
+    return FlowIndex(df, positions)
@@ -6,9 +6,13 @@
 ###############################################################################
 # DEPENDENCIES
 ###############################################################################
+from concurrent.futures import ThreadPoolExecutor
+
 import olca_schema as olca
 import pandas as pd
 
+from src.create_olca_process.descriptor_cache import iter_descriptor_batches
+
 
 ###############################################################################
 # DOCUMENTATION
@@ -30,6 +34,12 @@ The function takes one main argument/input:
 
 1.  client object (IPC client)
 
+The process descriptors are shared with other callers through the descriptor
+cache (see descriptor_cache.py). Each process is read from openLCA with its
+own IPC request; the requests are sent from a thread pool so that their round
+trips overlap. The processes are read in batches and only their output
+exchanges are kept, so at most one batch of full process objects is held in
+memory at a time. An error while reading a process is raised to the caller.
 """
 __all__ = [
     "create_exchange_database",
@@ -39,26 +49,80 @@ __all__ = [
 ###############################################################################
 # FUNCTIONS
 ###############################################################################
-def create_exchange_database(client):
+def create_exchange_database(client, max_workers=8, cache_ttl=60.0,
+                             batch_size=256):
     """Create a data frame with all exchanges that are outputs and their
-    respective process universally unique identifiers."""
-    # get all processes
-    process_descriptors = client.get_descriptors(olca.Process)
+    respective process universally unique identifiers.
+
+    The columns ('process_uuid', 'exchange_uuid', and 'process_name') use
+    the pandas categorical data type.
+
+    Parameters
+    ----------
+    client : NetlOlca
+        The netlolca client instance.
+    max_workers : int, optional
+        The maximum number of concurrent process requests; use 1 to send
+        them one at a time. Defaults to 8.
+    cache_ttl : float, optional
+        How long, in seconds, cached process descriptors are reused.
+        Defaults to 60.
+    batch_size : int, optional
+        The number of processes read from openLCA before their exchanges are
+        collected. Defaults to 256.
+
+    Returns
+    -------
+    pandas.DataFrame
+        A data frame of output exchange flows and their processes.
+    """
+    def _query(descriptor):
+        return client.query(olca.Process, descriptor.id)
 
     exchange_database = []
 
-    # get all exchanges
-    for process in process_descriptors:
-        process = client.query(olca.Process, process.id)
-        for exchange in process.exchanges:
-            # Only include output exchanges that have a flow attached
-            if (not exchange.is_input
-                    and getattr(exchange, 'flow', None) is not None):
-                exchange_database.append({
-                    'process_uuid': process.id,
-                    'exchange_uuid': exchange.flow.id,
-                    'process_name': process.name,
-                })
-    exchange_database = pd.DataFrame(exchange_database)
+    # get all processes, one batch at a time; executor.map keeps the
+    # descriptor order
+    executor = None
+    if max_workers > 1:
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        for batch in iter_descriptor_batches(
+                client, olca.Process, size=batch_size, ttl=cache_ttl):
+            if executor is None:
+                processes = map(_query, batch)
+            else:
+                processes = executor.map(_query, batch)
+
+            for process in processes:
+                # The cached descriptors may list a process that has since
+                # been deleted from the database
+                if process is None:
+                    continue
+                # Only include output exchanges that have a flow attached
+                exchange_database.extend([
+                    {
+                        'process_uuid': process.id,
+                        'exchange_uuid': exchange.flow.id,
+                        'process_name': process.name,
+                    }
+                    for exchange in (process.exchanges or [])
+                    if exchange.flow is not None and not exchange.is_input
+                ])
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    exchange_database = pd.DataFrame(
+        exchange_database,
+        columns=['process_uuid', 'exchange_uuid', 'process_name']
+    )
+    # Processes have many output exchanges, so the UUIDs and names repeat;
+    # store them once per unique value.
+    exchange_database = exchange_database.astype({
+        'process_uuid': 'category',
+        'exchange_uuid': 'category',
+        'process_name': 'category',
+    })
 
     return exchange_database
@@ -7,7 +7,8 @@
 # DEPENDENCIES
 ###############################################################################
 import olca_schema as olca
-import olca_schema.units as o_units
+
+from src.create_olca_process.unit_lookup import lookup_property_ref, lookup_unit_ref
 
 
 ###############################################################################
@@ -83,9 +84,7 @@ def create_exchange_elementary_flow(client,
     # this would be the one that help define the unit of the flow (e.g., mass,
     # volume, energy, etc.), and flow.flow_properties is a list of
     # FlowPropertyFactors we want the one that is_ref_flow_property = true
-    flow_property = o_units.property_ref(unit)
-    if flow_property is None:
-        flow_property = o_units.property_ref(unit.lower())
+    flow_property = lookup_property_ref(unit)
     if flow_property is None:
         raise ValueError(
             "The flow property is not found in the flow. "
@@ -105,9 +104,7 @@ def create_exchange_elementary_flow(client,
 
 	# Set the FlowProperty reference on the exchange
     exchange.flow_property = flow_property
-    exchange.unit = o_units.unit_ref(unit)
-    if exchange.unit is None:
-        exchange.unit = o_units.unit_ref(unit.lower())
+    exchange.unit = lookup_unit_ref(unit)
     exchange.amount = float(amount)
     exchange.is_input = is_input
 
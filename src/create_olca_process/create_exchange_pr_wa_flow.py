@@ -7,7 +7,8 @@
 # DEPENDENCIES
 ###############################################################################
 import olca_schema as olca
-import olca_schema.units as o_units
+
+from src.create_olca_process.unit_lookup import lookup_property_ref, lookup_unit_ref
 
 
 ###############################################################################
@@ -88,9 +89,7 @@ def create_exchange_pr_wa_flow(client,
         raise ValueError("Provided flow is not a PRODUCT or WASTE flow")
 
     # Get reference flow property
-    flow_property = o_units.property_ref(unit)
-    if flow_property is None:
-        flow_property = o_units.property_ref(unit.lower())
+    flow_property = lookup_property_ref(unit)
     if flow_property is None:
         raise ValueError(
             "The flow property is not found in the flow. "
@@ -101,9 +100,7 @@ def create_exchange_pr_wa_flow(client,
     exchange = client.make_exchange()
     exchange.flow = flow
     exchange.flow_property = flow_property
-    exchange.unit = o_units.unit_ref(unit)
-    if exchange.unit is None:
-        exchange.unit = o_units.unit_ref(unit.lower())
+    exchange.unit = lookup_unit_ref(unit)
     exchange.amount = float(amount)
     exchange.is_input = is_input
     exchange.default_provider = olca.Ref.from_dict(
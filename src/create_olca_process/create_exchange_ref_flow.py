@@ -6,12 +6,16 @@
 ###############################################################################
 # DEPENDENCIES
 ###############################################################################
+import functools
+import logging
 import uuid
 
 import olca_schema as olca
-import olca_schema.units as o_units
 
+from src.create_olca_process._client_cache import _prompt
+from src.create_olca_process.flow_search_function import clear_flow_descriptor_cache
 from src.create_olca_process.search_flows_only import search_and_select_flows
+from src.create_olca_process.unit_lookup import lookup_property_ref, lookup_unit_ref
 
 
 ###############################################################################
@@ -48,6 +52,8 @@ create_new_process.py is the following:
 9.  Return the exchange
 """
 __all__ = [
+    "build_flow_property_index",
+    "clear_flow_property_index",
     "create_exchange_ref_existing_flow",
     "create_exchange_ref_flow",
     "create_exchange_ref_new_flow",
@@ -56,6 +62,12 @@ __all__ = [
 ]
 
 
+###############################################################################
+# GLOBALS
+###############################################################################
+logger = logging.getLogger(__name__)
+
+
 ###############################################################################
 # FUNCTIONS
 ###############################################################################
@@ -63,13 +75,13 @@ def create_exchange_ref_flow(client,flowName, amount, unit, isInput, isRef):
     """Request from user the new flow or existing flow for the reference exchange.
     """
     # Get input from user
-    print (
+    print(
         "Do you want to select an existing quantitative reference flow or "
-        "create a new one?"
+        "create a new one?\n"
+        "1. Select existing flow\n"
+        "2. Create new flow"
     )
-    print ("1. Select existing flow")
-    print ("2. Create new flow")
-    choice = input("Enter your choice (1 or 2): ")
+    choice = _prompt("Enter your choice (1 or 2): ")
     if choice == "1":
         flow_uuid = search_and_select_flows(keywords=None, client=client)
         return create_exchange_ref_existing_flow(client, flow_uuid, amount, unit)
@@ -109,10 +121,7 @@ def create_exchange_ref_existing_flow(client, flow_uuid, amount, unit):
         raise ValueError(f"Flow not found: {flow_uuid}")
 
     # Get reference flow property
-    factor = next((f for f in flow.flow_properties if f.is_ref_flow_property), flow.flow_properties[0])
-    flow_property = o_units.property_ref(unit)
-    if flow_property is None:
-        flow_property = o_units.property_ref(unit.lower())
+    flow_property = lookup_property_ref(unit)
     if flow_property is None:
         raise ValueError(
             "The flow property is not found in the flow. "
@@ -123,9 +132,7 @@ def create_exchange_ref_existing_flow(client, flow_uuid, amount, unit):
     exchange = client.make_exchange()
     exchange.flow = flow
     exchange.flow_property = flow_property.to_ref() if hasattr(flow_property, "to_ref") else flow_property
-    exchange.unit = o_units.unit_ref(unit)
-    if exchange.unit is None:
-        exchange.unit = o_units.unit_ref(unit.lower())
+    exchange.unit = lookup_unit_ref(unit)
     exchange.amount = amount
     exchange.is_input = False
     exchange.is_quantitative_reference = True
@@ -141,9 +148,7 @@ def create_exchange_ref_new_flow(client,
                                  isRef):
     """Create exchange for reference flow using a new flow."""
     # Get unit object from unit name passed in the function
-    unit_obj = o_units.unit_ref(unit)
-    if unit_obj is None:
-        unit_obj = o_units.unit_ref(unit.lower())
+    unit_obj = lookup_unit_ref(unit)
 
     # Find a flow property that contains this unit.
     flow_property = find_flow_property_for_unit(client, unit_obj)
@@ -178,6 +183,8 @@ def create_exchange_ref_new_flow(client,
     # Save the flow to the database first.
     saved_flow = client.client.put(ex_flow)
     print(f"Created flow: {saved_flow.name} with ID: {saved_flow.id}")
+    # Make the new flow visible to later flow searches
+    clear_flow_descriptor_cache()
 
     # Create a flow reference for the exchange.
     flow_ref = olca.Ref(
@@ -198,7 +205,58 @@ def create_exchange_ref_new_flow(client,
     return exchange
 
 
-def find_flow_property_for_unit(client, unit_obj):
+def build_flow_property_index(client):
+    """
+    Map units to the flow properties that contain them.
+
+    Callers that look up flow properties for many units should build the
+    index once and pass it to :func:`find_flow_property_for_unit`.
+
+    Parameters
+    ----------
+    client: NetlOlca
+        Client object.
+
+    Returns
+    -------
+    dict
+        A dictionary with keys ('id', unit UUID) and ('name', unit name) and
+        values of olca.FlowProperty. When a unit belongs to more than one
+        flow property, the first one found is kept.
+    """
+    index = {}
+
+    # Get all flow properties and unit groups using NetlOlca's method; one
+    # request each, rather than one request per flow property's unit group
+    flow_properties = client.get_all(olca.FlowProperty)
+    unit_groups = {
+        unit_group.id: unit_group
+        for unit_group in (client.get_all(olca.UnitGroup) or [])
+    }
+
+    # Index the units in the unit group of each flow property
+    # The olca_schema classes always define their fields (None when unset),
+    # so the fields are tested for values rather than with hasattr
+    for flow_property in flow_properties:
+        if flow_property.unit_group is not None:
+            # Get the unit group
+            if flow_property.unit_group.id is not None:
+                unit_group = unit_groups.get(flow_property.unit_group.id)
+                if unit_group is not None and unit_group.units:
+                    # Units almost always have both attributes, so access
+                    # them directly rather than testing with hasattr
+                    for unit in unit_group.units:
+                        try:
+                            unit_id, unit_name = unit.id, unit.name
+                        except AttributeError:
+                            continue
+                        index.setdefault(('id', unit_id), flow_property)
+                        index.setdefault(('name', unit_name), flow_property)
+
+    return index
+
+
+def find_flow_property_for_unit(client, unit_obj, index=None):
     """
     Find a flow property that contains the given unit.
 
@@ -208,6 +266,10 @@ def find_flow_property_for_unit(client, unit_obj):
         Client object.
     unit_obj: olca-schema.Unit
         The unit object from which to find a flow property.
+    index: dict, optional
+        A prebuilt index from :func:`build_flow_property_index`. If not
+        provided, the index is built on the first call for this client and
+        reused by later calls (see :func:`clear_flow_property_index`).
 
     Returns
     -------
@@ -215,35 +277,41 @@ def find_flow_property_for_unit(client, unit_obj):
         A flow property containing this unit or None if not found.
     """
     try:
-        # Get all flow properties using NetlOlca's method
-        flow_properties = client.get_all(olca.FlowProperty)
-
-        # Search through flow properties to find one that has the unit in its
-        # unit group
-        for flow_property in flow_properties:
-            if (hasattr(flow_property, 'unit_group')
-                    and flow_property.unit_group):
-                # Get the unit group
-                if hasattr(flow_property.unit_group, 'id'):
-                    unit_group = client.client.get(
-                        olca.UnitGroup,
-                        flow_property.unit_group.id
-                    )
-                    if hasattr(unit_group, 'units') and unit_group.units:
-                        for unit in unit_group.units:
-                            if hasattr(unit, 'id') and hasattr(unit_obj, 'id'):
-                                if unit.id == unit_obj.id:
-                                    return flow_property
-                            elif (hasattr(unit, 'name')
-                                    and hasattr(unit_obj, 'name')):
-                                if unit.name == unit_obj.name:
-                                    return flow_property
+        if index is None:
+            # Flow properties and unit groups rarely change during a session
+            index = _get_flow_property_index(client)
+
+        # Match on the unit UUID when available, otherwise on its name
+        if getattr(unit_obj, 'id', None) is not None:
+            return index.get(('id', unit_obj.id))
+        elif getattr(unit_obj, 'name', None) is not None:
+            return index.get(('name', unit_obj.name))
     except Exception as e:
-        print(f"Error finding flow property for unit: {e}")
+        logger.warning("Error finding flow property for unit: %s", e)
 
     return None
 
 
+def clear_flow_property_index():
+    """Clear the flow property indexes kept by
+    :func:`find_flow_property_for_unit`.
+
+    Call this after adding or changing flow properties or unit groups in the
+    openLCA database.
+    """
+    _get_flow_property_index.cache_clear()
+
+
+@functools.lru_cache(maxsize=8)
+def _get_flow_property_index(client):
+    """Helper function to get a (cached) flow property index for a client.
+
+    The cache is keyed by the client itself (not its id), so a new client
+    never gets another client's index.
+    """
+    return build_flow_property_index(client)
+
+
 def generate_id(prefix: str = "entity") -> str:
     """
     Generate a unique ID for openLCA entities.
@@ -9,15 +9,20 @@
 import logging
 import uuid
 import datetime
+from concurrent.futures import ThreadPoolExecutor
 
 import pandas as pd
 import olca_schema as olca
 
 from src.create_olca_process.search_flows_and_providers import search_and_select
+from src.create_olca_process.flow_search_function import search_Flows_by_keywords
 from src.create_olca_process.create_exchange_elementary_flow import create_exchange_elementary_flow
 from src.create_olca_process.create_exchange_pr_wa_flow import create_exchange_pr_wa_flow
 from src.create_olca_process.create_exchange_database import create_exchange_database
+from src.create_olca_process.descriptor_cache import invalidate_descriptors
+from src.create_olca_process.build_flow_index import build_flow_index
 from src.create_olca_process.create_exchange_ref_flow import create_exchange_ref_flow
+from src.create_olca_process._client_cache import _prompt
 
 
 ###############################################################################
@@ -45,12 +50,20 @@ __all__ = [
 ###############################################################################
 logger = logging.getLogger(__name__)
 
+_SESSION_CACHE_TTL = 3600.0
+'''float : How long, in seconds, flow search results are reused while a
+process is created; prefetched searches must still be cached when the user
+reaches their rows.'''
 
 
 ###############################################################################
 # FUNCTIONS
 ###############################################################################
-def create_new_process(client, df, process_name, process_description):
+def create_new_process(client,
+                       df,
+                       process_name,
+                       process_description,
+                       choose=None):
     """Create a new process in openLCA.
 
     Parameters
@@ -63,6 +76,12 @@ def create_new_process(client, df, process_name, process_description):
         Process name.
     process_description : str
         Process description.
+    choose : callable, optional
+        A function called as ``choose(rows, prompt)`` that returns the
+        zero-based index of the flow or provider to select (or None to
+        abort), used instead of the selection menus for product and waste
+        flows. The flow names are then searched without a keyword prompt.
+        Defaults to none (interactive selection).
 
     Returns
     -------
@@ -87,12 +106,72 @@ def create_new_process(client, df, process_name, process_description):
     # 3. Create exchange database
     print('Creating exchange database, this may take a couple minutes...')
     exchange_database = create_exchange_database(client)
+    # Index the exchanges by flow so each provider search is a lookup
+    exchange_database = build_flow_index(exchange_database)
 
-    # 4. Create exchanges
-    exchanges = []
+    # Start the default flow searches in the background, so their results
+    # are cached by the time each row is reached
+    prefetch = _prefetch_searches(client, df)
+
+    # 4. Create exchanges (one per data frame row, unless skipped)
+    try:
+        exchanges = list(
+            _iter_exchanges(client, df, exchange_database, choose=choose)
+        )
+    finally:
+        # Do not wait on searches for rows that were skipped
+        prefetch.shutdown(wait=False, cancel_futures=True)
+
+    # 5. Create process
+    process.exchanges = exchanges
+
+    # 6. Save process to openLCA
+    created_process = client.client.put(process)
+    # The new process is not in any cached process descriptor list
+    invalidate_descriptors(olca.Process)
+    print(
+        f"Successfully created process: {process_name}\n"
+        "Process saved successfully to openLCA database!"
+    )
+    return created_process
+
+
+def _iter_exchanges(client, df, exchange_database, choose=None):
+    """Helper function to create the exchanges for a process.
+
+    Rows are handled one at a time (with user input for flow and provider
+    selection) and each exchange is yielded as soon as it is created. When a
+    product or waste flow row repeats the flow name, type, and unit of an
+    earlier row, the earlier flow and provider are used without prompting.
+
+    Parameters
+    ----------
+    client : NetlOlca
+        A NetlOlca class instance, connected to IPC service.
+    df : pandas.DataFrame
+        A data frame with process data.
+    exchange_database : pandas.DataFrame or FlowIndex
+        The exchange data frame, or a flow index built from it.
+    choose : callable, optional
+        A selection function passed to search_and_select. Defaults to none.
+
+    Yields
+    ------
+    olca-schema.Exchange
+        An exchange for a data frame row.
+
+    Raises
+    ------
+    ValueError
+        Invalid category found in data frame.
+    """
+    # Flow and provider choices that produced an exchange, keyed by the
+    # casefolded flow name, flow type, and unit
+    selections = {}
 
     # Loop through the dataframe, find reference product, and create exchanges
-    for _, row in df.iterrows():
+    # (rows as plain dictionaries; iterrows builds a Series for every row)
+    for row in df.to_dict('records'):
         # Gives you the option to try again if you make a mistake
         while True:
             try:
@@ -104,11 +183,11 @@ def create_new_process(client, df, process_name, process_description):
                 # TODO: add a check to see if there is more than one reference
                 # product. Just want to have a warning printed.
                 if row['Reference_Product']:
-                    print("\n")
-                    print(f"Creating exchange for reference product: {product}")
-                    print("----------------------------------------")
+                    _print_header(
+                        f"Creating exchange for reference product: {product}"
+                    )
                     exchange = create_exchange_ref_flow(client, product, amount, unit, is_input, row['Reference_Product'])
-                    exchanges.append(exchange)
+                    yield exchange
                     # If reference flow, then we don't need to search for a
                     # process.
                     break
@@ -116,10 +195,12 @@ def create_new_process(client, df, process_name, process_description):
                     # If not elementary flow, the we need to identify flow
                     # category, search for a flow and process/provider to
                     # create an exchange.
-                    if row['Category'].lower() == 'elementary flows':
-                        print("\n")
-                        print(f"Creating exchange for elementary flow: {product}")
-                        print("--------------------------------------")
+                    # Lower-case the category once for the checks below
+                    category = row['Category'].lower()
+                    if category == 'elementary flows':
+                        _print_header(
+                            f"Creating exchange for elementary flow: {product}"
+                        )
                         try:
                             exchange = create_exchange_elementary_flow(
                                 client, flow_uuid, unit, amount, is_input
@@ -128,7 +209,7 @@ def create_new_process(client, df, process_name, process_description):
                                 "Exchange created for elementary flow: "
                                 f"{product}"
                             )
-                            exchanges.append(exchange)
+                            yield exchange
                             break
                         except Exception as e:
                             print(
@@ -138,18 +219,29 @@ def create_new_process(client, df, process_name, process_description):
                             break
 
                     # If product flow, then we need to search for a process
-                    elif (row['Category'].lower() == 'technosphere flows'
-                            or row['Category'].lower() == 'product flows'):
-                        print("\n")
-                        print(f"Creating exchange for product flow: {product}")
-                        print("-----------------------------------")
-                        flow_uuid, provider_uuid = search_and_select(
-                            exchanges_df=exchange_database,
-                            keywords=product,
-                            flow_type_str='product',
-                            client=client,
-                            unit=unit
+                    elif category in ('technosphere flows', 'product flows'):
+                        _print_header(
+                            f"Creating exchange for product flow: {product}"
                         )
+                        # Reuse the choice made for an earlier row with the
+                        # same flow name, flow type, and unit
+                        key = (str(product).casefold(), 'product', unit)
+                        if key in selections:
+                            flow_uuid, provider_uuid = selections[key]
+                            print(
+                                "Using the flow and provider selected "
+                                f"earlier for: {product}"
+                            )
+                        else:
+                            flow_uuid, provider_uuid = search_and_select(
+                                exchanges_df=exchange_database,
+                                keywords=product,
+                                flow_type_str='product',
+                                client=client,
+                                unit=unit,
+                                choose=choose,
+                                cache_ttl=_SESSION_CACHE_TTL
+                            )
                         # Allows user to skip the flow
                         if flow_uuid == 'skip':
                             print(f"Skipping flow: {product}")
@@ -167,7 +259,8 @@ def create_new_process(client, df, process_name, process_description):
                                 "Exchange created for product "
                                 f"flow: {product}"
                             )
-                            exchanges.append(exchange)
+                            selections[key] = (flow_uuid, provider_uuid)
+                            yield exchange
                             break
                         except Exception as e:
                             print(
@@ -178,17 +271,29 @@ def create_new_process(client, df, process_name, process_description):
                         # exchange and move to the next row.
 
                     # If waste flow, then we need to search for a process.
-                    elif row['Category'].lower() == 'waste flows':
-                        print("\n")
-                        print(f"Creating exchange for waste flow: {product}")
-                        print("---------------------------------")
-                        flow_uuid, provider_uuid = search_and_select(
-                            exchanges_df=exchange_database,
-                            keywords=product,
-                            flow_type_str='waste',
-                            client=client,
-                            unit=unit
+                    elif category == 'waste flows':
+                        _print_header(
+                            f"Creating exchange for waste flow: {product}"
                         )
+                        # Reuse the choice made for an earlier row with the
+                        # same flow name, flow type, and unit
+                        key = (str(product).casefold(), 'waste', unit)
+                        if key in selections:
+                            flow_uuid, provider_uuid = selections[key]
+                            print(
+                                "Using the flow and provider selected "
+                                f"earlier for: {product}"
+                            )
+                        else:
+                            flow_uuid, provider_uuid = search_and_select(
+                                exchanges_df=exchange_database,
+                                keywords=product,
+                                flow_type_str='waste',
+                                client=client,
+                                unit=unit,
+                                choose=choose,
+                                cache_ttl=_SESSION_CACHE_TTL
+                            )
                         # Allows user to skip the flow
                         if flow_uuid == 'skip':
                             print(f"Skipping flow: {product}")
@@ -206,7 +311,8 @@ def create_new_process(client, df, process_name, process_description):
                                 "Exchange created for waste "
                                 f"flow: {product}"
                             )
-                            exchanges.append(exchange)
+                            selections[key] = (flow_uuid, provider_uuid)
+                            yield exchange
                             break
                         except Exception as e:
                             print(
@@ -224,22 +330,79 @@ def create_new_process(client, df, process_name, process_description):
             # category.
             except Exception as e:
                 print(f"Error creating exchange for flow: {e}")
-                retry_response = input(
+                retry_response = _prompt(
                     "Do you want to try again? (y/n): "
-                ).strip()
-                if retry_response.lower().startswith('y'):
+                ).strip().lower()
+                if retry_response.startswith('y'):
                     continue
-                elif retry_response.lower().startswith('n'):
+                elif retry_response.startswith('n'):
                     break
 
-    # 5. Create process
-    process.exchanges = exchanges
 
-    # 6. Save process to openLCA
-    created_process = client.client.put(process)
-    print(f"Successfully created process: {process_name}")
-    print(f"Process saved successfully to openLCA database!")
-    return created_process
+def _print_header(title):
+    """Helper function to print a row header with one write."""
+    print(f"\n\n{title}\n{'-' * len(title)}")
+
+
+def _prefetch_searches(client, df, max_workers=4):
+    """Helper function to run the default flow searches in the background.
+
+    Each product or waste flow row is searched by its flow name (the default
+    keywords offered to the user), so the results are in the flow search
+    cache when the row is processed. The results are cached for the whole
+    session (see _SESSION_CACHE_TTL), and each search queries its flows one
+    at a time, so at most ``max_workers`` requests run at once next to the
+    interactive searches.
+
+    Parameters
+    ----------
+    client : NetlOlca
+        A NetlOlca class instance, connected to IPC service.
+    df : pandas.DataFrame
+        A data frame with process data.
+    max_workers : int, optional
+        The maximum number of concurrent searches. Defaults to 4.
+
+    Returns
+    -------
+    concurrent.futures.ThreadPoolExecutor
+        The executor running the searches; shut it down when done.
+    """
+    flow_types = {
+        'technosphere flows': olca.FlowType.PRODUCT_FLOW,
+        'product flows': olca.FlowType.PRODUCT_FLOW,
+        'waste flows': olca.FlowType.WASTE_FLOW,
+    }
+
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    if 'Category' not in df.columns:
+        return executor
+
+    # Pair each row's flow name with its search type (NaN for elementary
+    # and other flows), for the rows that are not the reference product
+    # (the string dtype lets .str work on columns with missing values)
+    searches = pd.DataFrame({
+        'product': df['Flow_Name'].astype('string'),
+        'flow_type': (
+            df['Category'].astype('string').str.lower().map(flow_types)
+        ),
+    })
+    searches = searches[
+        ~df['Reference_Product'].fillna(False).astype(bool)
+        & (searches['product'].str.len().fillna(0) > 0)
+    ]
+    # Several rows may share a flow name; search each pair only once
+    searches = searches.dropna().drop_duplicates()
+
+    for product, flow_type in searches.itertuples(index=False, name=None):
+        executor.submit(
+            search_Flows_by_keywords, client, product, flow_type,
+            verbose=False,
+            cache_ttl=_SESSION_CACHE_TTL,
+            max_workers=1
+        )
+
+    return executor
 
 
 def read_dataframe(df):
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# descriptor_cache.py
+#
+###############################################################################
+# DEPENDENCIES
+###############################################################################
+import collections
+import threading
+import time
+
+
+###############################################################################
+# DOCUMENTATION
+###############################################################################
+__doc__ = """
+This module has functions to cache the descriptors of an openLCA database
+(connected through IPC) between calls.
+
+**Logic**
+
+Getting the descriptors of a type (e.g., olca.Flow or olca.Process) downloads
+the full catalog of that type. The descriptor lists are kept per client and
+type for ``ttl`` seconds, so functions that are called repeatedly in a session
+(e.g., flow searches or building the exchange database) share one download.
+
+Call :func:`invalidate_descriptors` after adding or removing entities in the
+openLCA database.
+
+:func:`iter_descriptor_batches` yields the cached descriptors in fixed-size
+batches, so callers that query the full entity for each descriptor (e.g.,
+every process) can drop each batch of entities before requesting the next.
+"""
+__all__ = [
+    "cached_descriptors",
+    "invalidate_descriptors",
+    "iter_descriptor_batches",
+]
+
+
+###############################################################################
+# GLOBALS
+###############################################################################
+_CACHE = collections.OrderedDict()
+'''collections.OrderedDict : Descriptor lists keyed by client and type, least
+recently used first; values are tuples of the download time and the
+descriptor list.'''
+
+_CACHE_SIZE = 16
+'''int : The maximum number of cached descriptor lists.'''
+
+_LOCK = threading.Lock()
+'''threading.Lock : Lets only one thread download descriptors at a time, so
+concurrent callers share one download.'''
+
+
+###############################################################################
+# FUNCTIONS
+###############################################################################
+def cached_descriptors(client, cls, ttl=60.0):
+    """Get the descriptors of a type, reusing a cached list.
+
+    Parameters
+    ----------
+    client : NetlOlca
+        The netlolca client instance.
+    cls : type
+        An olca_schema class (e.g., olca.Flow).
+    ttl : float, optional
+        How long, in seconds, a cached list is reused. A value of zero always
+        downloads the descriptors. Defaults to 60.
+
+    Returns
+    -------
+    list
+        A list of descriptors (olca.Ref). Do not modify it; it is shared
+        with other callers.
+    """
+    # Keyed by the client itself (not its id), so a new client never gets
+    # another client's descriptors
+    key = (client, cls)
+    with _LOCK:
+        now = time.monotonic()
+        cached = _CACHE.get(key)
+        if cached is not None and now - cached[0] < ttl:
+            _CACHE.move_to_end(key)
+            return cached[1]
+
+        descriptors = client.get_descriptors(cls) or []
+        # Empty lists are not cached, so a database that is still loading
+        # is read again on the next call
+        if descriptors:
+            _CACHE[key] = (now, descriptors)
+            _CACHE.move_to_end(key)
+            while len(_CACHE) > _CACHE_SIZE:
+                _CACHE.popitem(last=False)
+
+    return descriptors
+
+
+def invalidate_descriptors(cls=None):
+    """Clear cached descriptors.
+
+    Parameters
+    ----------
+    cls : type, optional
+        The olca_schema class to clear (for all clients). Defaults to none,
+        which clears all cached descriptors.
+    """
+    with _LOCK:
+        if cls is None:
+            _CACHE.clear()
+        else:
+            for key in [k for k in _CACHE if k[1] is cls]:
+                del _CACHE[key]
+
+
+def iter_descriptor_batches(client, cls, size=256, ttl=60.0):
+    """Yield the descriptors of a type in batches.
+
+    Parameters
+    ----------
+    client : NetlOlca
+        The netlolca client instance.
+    cls : type
+        An olca_schema class (e.g., olca.Process).
+    size : int, optional
+        The number of descriptors per batch. Defaults to 256.
+    ttl : float, optional
+        How long, in seconds, a cached list is reused (see
+        :func:`cached_descriptors`). Defaults to 60.
+
+    Yields
+    ------
+    list
+        A list of at most ``size`` descriptors (olca.Ref).
+    """
+    if size < 1:
+        raise ValueError("Batch size must be a positive integer")
+    descriptors = cached_descriptors(client, cls, ttl=ttl)
+    for start in range(0, len(descriptors), size):
+        yield descriptors[start:start + size]
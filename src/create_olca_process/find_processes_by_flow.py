@@ -8,6 +8,8 @@
 ###############################################################################
 import pandas as pd
 
+from src.create_olca_process.build_flow_index import FlowIndex
+
 
 ###############################################################################
 # DOCUMENTATION
@@ -33,7 +35,8 @@ IPC) for processes that produce or are associated with a given flow.
 
 The function takes two main arguments/inputs:
 
-1.  exchanges_df: dataframe containing exchanges
+1.  exchanges_df: dataframe containing exchanges, or a flow index built from
+    it with build_flow_index.py
 2.  flow_uuid: UUID of the flow to search for
 
 The function filters rows from the database that have a matching flow UUID and
@@ -42,7 +45,7 @@ returns the process UUID column.
 The function then:
 
 1.  Filters rows from the database that have a flow uuid that matches the
-    flow_uuid.
+    flow_uuid (or looks the flow uuid up in the flow index).
 2.  Return the process uuid column.
 """
 __all__ = [
@@ -59,8 +62,9 @@ def find_processes_by_flow(exchanges_df, flow_uuid: str):
 
     Parameters
     ----------
-    exchanges_df : pandas.DataFrame
-        A data frame of exchange flows.
+    exchanges_df : pandas.DataFrame or FlowIndex
+        A data frame of exchange flows, or a flow index built from it (see
+        build_flow_index.py).
     flow_uuid : str
         The universally unique identifier for a flow.
 
@@ -69,11 +73,15 @@ def find_processes_by_flow(exchanges_df, flow_uuid: str):
     pandas.DataFrame
         A reduced data frame where rows contain the flow UUID in the exchanges.
     """
+    # Flow index: a dictionary lookup instead of a scan
+    if isinstance(exchanges_df, FlowIndex):
+        return exchanges_df.get(flow_uuid)
+
     # Dataframe containing exchanges
     df = pd.DataFrame(exchanges_df)
 
     # Filter rows from the database that have a flow uuid that matches the
     # flow_uuid
-    df.drop(df[df['exchange_uuid'] != flow_uuid].index, inplace=True)
+    df = df[df['exchange_uuid'] == flow_uuid]
 
     return df
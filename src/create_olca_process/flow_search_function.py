@@ -6,13 +6,22 @@
 ###############################################################################
 # DEPENDENCIES
 ###############################################################################
+import bisect
+import collections
+import itertools
 import logging
 import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 
 import olca_schema as olca
 import pandas as pd
 
+from src.create_olca_process.descriptor_cache import cached_descriptors
+from src.create_olca_process.descriptor_cache import invalidate_descriptors
+
 
 ###############################################################################
 # DOCUMENTATION
@@ -36,12 +45,24 @@ The main function takes three main arguments/inputs
 2.  the flow type to search for
 3.  the client object
 
-The keyword is modified using the re.escape function to handle special regex
-characters (if input by the user).
+The keyword is matched as a case-insensitive substring of the flow names.
+Regular expression matching is available through the ``use_regex`` option.
+The matching flows are ordered by how well their names match: exact matches
+first, then names that start with the keyword, then the other matches (each
+group in database order).
 The function uses the netlolca function .get_descriptors(olca.Flow) to get all
 flow descriptors.
+The descriptors are cached per client for ``cache_ttl`` seconds, so repeated
+searches in a session do not download them again. The results of a search
+are cached for the same time, so repeating a search (e.g., the same product
+name on several rows) does not query the flows again; searches without
+matches are cached too, so a misspelled name is not searched again. Only the
+most recently used results are kept, and expired results are dropped whenever
+a new result is cached. Call
+:func:`clear_flow_descriptor_cache` after adding flows to the database.
 The function uses the netlolca function .query(olca.Flow, descriptor.id) to get
-the full flow object.
+the full flow object; these requests are sent from a thread pool so that the
+IPC round trips overlap.
 The ``matching_flows`` variable is the first list returned by the function -->
 it is a list of flow objects.
 The ``clean_df`` variable is the second dataframe returned by the function -->
@@ -56,16 +77,72 @@ The function returns three outputs:
 3.  full_df: dataframe with all flow attributes
 """
 __all__ = [
+    "clear_flow_descriptor_cache",
     "search_Flows_by_keywords",
 ]
 
 
+###############################################################################
+# GLOBALS
+###############################################################################
+logger = logging.getLogger(__name__)
+
+_NAME_CACHE = collections.OrderedDict()
+'''collections.OrderedDict : Casefolded flow names keyed by client, oldest
+first; values are tuples of the cached descriptor list they were made from,
+the names joined into one string, and the start offset of each name in that
+string.'''
+
+_NAME_CACHE_SIZE = 8
+'''int : The maximum number of clients with cached flow names.'''
+
+_NAME_SEP = "\x00"
+'''str : Separator between the names in the joined name string.'''
+
+_RESULT_CACHE = collections.OrderedDict()
+'''collections.OrderedDict : Search results keyed by client and search
+options, least recently used first; values are tuples of the search time, the
+time to live, and the search result.'''
+
+_RESULT_CACHE_SIZE = 64
+'''int : The maximum number of cached search results.'''
+
+_RESULT_LOCK = threading.Lock()
+'''threading.Lock : Guards the search result cache, because searches may run
+from several threads (e.g., prefetched searches).'''
+
+_CLEAN_COLUMNS = ['Number', 'Flow_Name', 'UUID']
+'''list : Column names of the clean search result data frame.'''
+
+_FULL_COLUMNS = [
+    'Number', 'Flow_Name', 'UUID', 'Category', 'Description', 'Flow_Type',
+    'CAS', 'Formula', 'Is_Infrastructure_Flow', 'Last_Change', 'Library',
+    'Location', 'Synonyms', 'Tags', 'Version', 'Flow_Properties_Count',
+]
+'''list : Column names of the full search result data frame.'''
+
+_FLOW_TYPE_STR = {ft: str(ft) for ft in olca.FlowType}
+'''dict : String form of each flow type, so it is only formatted once.'''
+
+_EMPTY_CLEAN = pd.DataFrame(columns=_CLEAN_COLUMNS)
+'''pandas.DataFrame : Clean search result for a search without matches.'''
+
+_EMPTY_FULL = pd.DataFrame(columns=_FULL_COLUMNS)
+'''pandas.DataFrame : Full search result for a search without matches.'''
+
+
 ###############################################################################
 # FUNCTIONS
 ###############################################################################
 def search_Flows_by_keywords(client,
                              keywords: str,
-                             flow_type: Optional[olca.FlowType] = None):
+                             flow_type: Optional[olca.FlowType] = None,
+                             use_regex: bool = False,
+                             verbose: bool = True,
+                             use_cache: bool = True,
+                             cache_ttl: float = 60.0,
+                             max_results: Optional[int] = None,
+                             max_workers: int = 16):
     """
     Search for processes by keywords using netlolca functions.
 
@@ -81,93 +158,411 @@ def search_Flows_by_keywords(client,
     flow_type : olca.FlowType, optional
         Flow type to filter by (e.g., olca.FlowType.PRODUCT_FLOW,
         olca.FlowType.ELEMENTARY_FLOW, olca.FlowType.WASTE_FLOW).
+    use_regex : bool, optional
+        Whether to treat keywords as a regular expression rather than a
+        plain substring. Defaults to false.
+    verbose : bool, optional
+        Whether to print search status messages. When false, the messages
+        are sent to the module logger at the INFO level. Defaults to true.
+    use_cache : bool, optional
+        Whether to reuse flow descriptors downloaded, and results found, by
+        a previous search with the same client. Defaults to true.
+    cache_ttl : float, optional
+        How long, in seconds, cached flow descriptors and search results
+        are reused. Defaults to 60.
+    max_results : int, optional
+        The maximum number of matching flows to retrieve. The best-ranked
+        matches are kept (exact, then prefix, then other matches), and only
+        that many flows are queried from openLCA. Matching stops early once
+        this many exact matches are found. Defaults to None (no limit).
+    max_workers : int, optional
+        The maximum number of concurrent flow requests; use 1 to send them
+        one at a time. Defaults to 16.
 
     Returns
     -------
-    tuple or list
+    tuple
         A tuple of length three:
 
         - list, a list of matching flows
         - pandas.DataFrame, a data frame with just the flow names and UUIDs
         - pandas.DataFrame, a data frame with all flow attributes
 
-        An empty list is returned for a failed search.
+        For a search without matches (or a failed search), the list is empty
+        and the data frames have the same columns but no rows.
     """
     try:
-        print (f"Searching for flows containing '{keywords}'...")
+        _report(verbose, "Searching for flows containing '%s'...", keywords)
 
-        # Modify keywords for better matching.
-        # Using re.escape to handle special regex characters in keywords.
-        escaped_keywords = re.escape(keywords)
-        pattern = re.compile(f".*{escaped_keywords}.*", re.IGNORECASE)
+        # Reuse the result of an identical search; substring searches ignore
+        # case, so their keywords are casefolded for the key.
+        key = (
+            client,
+            keywords if use_regex else keywords.casefold(),
+            flow_type,
+            use_regex,
+            max_results,
+        )
+        cached = _get_cached_result(key, cache_ttl) if use_cache else None
+        if cached is not None:
+            matching_flows, clean_df, full_df = cached
+            _report(
+                verbose,
+                "Found %d cached flows matching '%s'",
+                len(matching_flows),
+                keywords
+            )
+            return list(matching_flows), clean_df.copy(), full_df.copy()
 
         # Get all flow descriptors
-        flow_descriptors = client.get_descriptors(olca.Flow)
+        flow_descriptors, name_blob, name_starts = _get_flow_descriptors(
+            client, ttl=cache_ttl if use_cache else 0
+        )
         if not flow_descriptors:
-            print("No flows found in database")
-            return []
+            _report(verbose, "No flows found in database")
+            return _empty_result()
+
+        # Case-insensitive substring match (casefold handles Unicode case
+        # differences that lower does not).
+        if use_regex:
+            # search is unanchored, so no leading or trailing '.*' is needed;
+            # IGNORECASE makes lowering the names unnecessary.
+            pattern = re.compile(keywords, re.IGNORECASE)
+            ranked = _iter_regex_matches(flow_descriptors, pattern)
+        else:
+            kw = keywords.casefold()
+            ranked = _iter_name_matches(name_blob, name_starts, kw)
 
-        matching_descriptors = []
-        for descriptor in flow_descriptors:
-            if pattern.search(descriptor.name.lower()):
-                matching_descriptors.append(descriptor)
+        # Sort the matches into exact, prefix, and other matches in the same
+        # pass as the match itself, rather than sorting them afterwards
+        buckets = ([], [], [])
+        for i, rank in ranked:
+            d = flow_descriptors[i]
+            # Flow descriptors carry the flow type, so drop the other types
+            # before querying the full flow objects (descriptors without a
+            # flow type are kept and checked after the query).
+            if (flow_type is not None
+                    and getattr(d, 'flow_type', None) not in (None, flow_type)):
+                continue
+            buckets[rank].append(d)
+            # Exact matches come first, so once there are enough of them the
+            # remaining names cannot change the result
+            if (max_results is not None and rank == 0
+                    and len(buckets[0]) >= max_results):
+                break
+
+        # With a limit, keep only the best-ranked matches
+        matching_descriptors = list(itertools.islice(
+            itertools.chain.from_iterable(buckets), max_results
+        ))
 
         if not matching_descriptors:
-            print(f"No flows found matching '{keywords}'")
-            return []
+            _report(verbose, "No flows found matching '%s'", keywords)
+            # Remember the miss, so repeating the search skips the name scan
+            if use_cache:
+                _cache_result(key, _empty_result(), cache_ttl)
+            return _empty_result()
 
-        print(f"Found {len(matching_descriptors)} flows matching '{keywords}'")
+        _report(
+            verbose,
+            "Found %d flows matching '%s'",
+            len(matching_descriptors),
+            keywords
+        )
 
         # Get full flow objects and filter by type if specified
-        matching_flows = []
-        for descriptor in matching_descriptors:
-            try:
-                flow = client.query(olca.Flow, descriptor.id)
-                if flow:
-                    # Filter by flow type if specified
-                    if flow_type is None or flow.flow_type == flow_type:
-                        matching_flows.append(flow)
-            except Exception as e:
-                logging.warning(f"Could not retrieve flow {descriptor.id}: {e}")
-                continue
+        flows = _bulk_query_flows(
+            client, [d.id for d in matching_descriptors], max_workers
+        )
+        matching_flows = [
+            flow for flow in flows
+            if flow and (flow_type is None or flow.flow_type == flow_type)
+        ]
 
         if flow_type:
-            print(f"Filtered to {len(matching_flows)} {flow_type.name} flows")
+            _report(
+                verbose,
+                "Filtered to %d %s flows",
+                len(matching_flows),
+                flow_type.name
+            )
+
+        # Create full dataframe with all flow attributes
+        full_df = pd.DataFrame({
+            'Number': range(1, len(matching_flows) + 1),
+            'Flow_Name': [f.name for f in matching_flows],
+            'UUID': [f.id for f in matching_flows],
+            'Category': [f.category for f in matching_flows],
+            'Description': [f.description for f in matching_flows],
+            'Flow_Type': [
+                _FLOW_TYPE_STR.get(f.flow_type) for f in matching_flows
+            ],
+            'CAS': [f.cas for f in matching_flows],
+            'Formula': [f.formula for f in matching_flows],
+            'Is_Infrastructure_Flow': [
+                f.is_infrastructure_flow for f in matching_flows
+            ],
+            'Last_Change': [f.last_change for f in matching_flows],
+            'Library': [f.library for f in matching_flows],
+            'Location': [
+                f.location.name if f.location else None
+                for f in matching_flows
+            ],
+            'Synonyms': [f.synonyms for f in matching_flows],
+            'Tags': [f.tags for f in matching_flows],
+            'Version': [f.version for f in matching_flows],
+            'Flow_Properties_Count': [
+                len(f.flow_properties) if f.flow_properties else 0
+                for f in matching_flows
+            ],
+        })
 
         # Create clean dataframe with just names and UUIDs
-        clean_data = []
-        for i, flow in enumerate(matching_flows, 1):
-            clean_data.append({
-                'Number': i,
-                'Flow_Name': flow.name,
-                'UUID': flow.id
-            })
-        clean_df = pd.DataFrame(clean_data)
+        clean_df = full_df.loc[:, _CLEAN_COLUMNS].copy()
 
-        # Create full dataframe with all flow attributes
-        full_data = []
-        for i, flow in enumerate(matching_flows, 1):
-            full_data.append({
-                'Number': i,
-                'Flow_Name': flow.name,
-                'UUID': flow.id,
-                'Category': flow.category,
-                'Description': flow.description,
-                'Flow_Type': str(flow.flow_type) if flow.flow_type else None,
-                'CAS': flow.cas,
-                'Formula': flow.formula,
-                'Is_Infrastructure_Flow': flow.is_infrastructure_flow,
-                'Last_Change': flow.last_change,
-                'Library': flow.library,
-                'Location': flow.location.name if flow.location else None,
-                'Synonyms': flow.synonyms,
-                'Tags': flow.tags,
-                'Version': flow.version,
-                'Flow_Properties_Count': len(flow.flow_properties) if flow.flow_properties else 0
-            })
-        full_df = pd.DataFrame(full_data)
+        # Cache a copy, so callers may modify the returned data frames
+        if use_cache:
+            _cache_result(
+                key,
+                (list(matching_flows), clean_df.copy(), full_df.copy()),
+                cache_ttl
+            )
 
         return matching_flows, clean_df, full_df
 
     except Exception as e:
-        logging.warning(f"Could not search for flows: {e}")
+        logger.warning("Could not search for flows: %s", e)
+        return _empty_result()
+
+
+def clear_flow_descriptor_cache():
+    """Clear the cached flow descriptors and search results.
+
+    Call this after adding or removing flows in the openLCA database, so the
+    next search downloads the flow descriptors again.
+    """
+    invalidate_descriptors(olca.Flow)
+    _NAME_CACHE.clear()
+    with _RESULT_LOCK:
+        _RESULT_CACHE.clear()
+
+
+def _cache_result(key, result, ttl):
+    """Helper function to cache a search result.
+
+    Expired results are dropped, and then the least recently used results,
+    so that at most ``_RESULT_CACHE_SIZE`` results are kept.
+    """
+    now = time.monotonic()
+    with _RESULT_LOCK:
+        _RESULT_CACHE[key] = (now, ttl, result)
+        _RESULT_CACHE.move_to_end(key)
+        expired = [
+            k for k, (cached_at, cached_ttl, _) in _RESULT_CACHE.items()
+            if now - cached_at >= cached_ttl
+        ]
+        for k in expired:
+            del _RESULT_CACHE[k]
+        while len(_RESULT_CACHE) > _RESULT_CACHE_SIZE:
+            _RESULT_CACHE.popitem(last=False)
+
+
+def _get_cached_result(key, ttl):
+    """Helper function to get a cached search result.
+
+    Returns None if the result is not cached or is older than ``ttl``
+    seconds.
+    """
+    with _RESULT_LOCK:
+        cached = _RESULT_CACHE.get(key)
+        if cached is None or time.monotonic() - cached[0] >= ttl:
+            return None
+        _RESULT_CACHE.move_to_end(key)
+        return cached[2]
+
+
+def _empty_result():
+    """Helper function to return the search result for no matches."""
+    return [], _EMPTY_CLEAN.copy(), _EMPTY_FULL.copy()
+
+
+def _get_flow_descriptors(client, ttl=60.0):
+    """Helper function to get all flow descriptors, reusing a cached list.
+
+    Parameters
+    ----------
+    client : NetlOlca
+        The netlolca client instance.
+    ttl : float, optional
+        How long, in seconds, a cached list is reused. A value of zero always
+        downloads the descriptors. Defaults to 60.
+
+    Returns
+    -------
+    tuple
+        A tuple of length three:
+
+        - list, flow descriptors
+        - str, the casefolded descriptor names (empty string for descriptors
+          without a name), in the same order, joined by a null character
+        - list, the start offset of each name in the joined string
+    """
+    descriptors = cached_descriptors(client, olca.Flow, ttl=ttl)
+
+    # Casefold and join the names once per download rather than once per
+    # search
+    cached = _NAME_CACHE.get(client)
+    if cached is not None and cached[0] is descriptors:
+        return descriptors, cached[1], cached[2]
+
+    names = [
+        d.name.casefold().replace(_NAME_SEP, " ") if d.name else ""
+        for d in descriptors
+    ]
+    blob = _NAME_SEP.join(names)
+    starts = [0]
+    starts.extend(
+        itertools.accumulate(len(name) + len(_NAME_SEP) for name in names)
+    )
+    del starts[-1]
+    if descriptors:
+        _NAME_CACHE.pop(client, None)
+        _NAME_CACHE[client] = (descriptors, blob, starts)
+        while len(_NAME_CACHE) > _NAME_CACHE_SIZE:
+            _NAME_CACHE.popitem(last=False)
+
+    return descriptors, blob, starts
+
+
+def _iter_name_matches(blob, starts, kw):
+    """Helper function to find the names that contain a keyword.
+
+    The keyword is searched for in the joined name string with str.find,
+    which scans the whole string in C rather than testing each name in a
+    Python loop.
+
+    Parameters
+    ----------
+    blob : str
+        The names joined by the separator (see _get_flow_descriptors).
+    starts : list
+        The start offset of each name in ``blob``.
+    kw : str
+        The casefolded keyword.
+
+    Yields
+    ------
+    tuple
+        The index of each name that contains the keyword, in order, and the
+        match rank: 0 for an exact match, 1 for a name that starts with the
+        keyword, and 2 otherwise.
+    """
+    if not starts:
+        return
+    if not kw or _NAME_SEP in kw:
+        # An empty keyword matches every name; a keyword with the separator
+        # matches none
+        if not kw:
+            for i in range(len(starts)):
+                yield i, 0 if _name_end(blob, starts, i) == starts[i] else 1
+        return
+
+    pos = blob.find(kw)
+    while pos != -1:
+        i = bisect.bisect_right(starts, pos) - 1
+        # str.find returns the first match in the name, so the name starts
+        # with the keyword only if that match is at the start of the name
+        if pos != starts[i]:
+            rank = 2
+        elif _name_end(blob, starts, i) == pos + len(kw):
+            rank = 0
+        else:
+            rank = 1
+        yield i, rank
+        # Continue from the start of the next name, so each name is only
+        # reported once
+        if i + 1 >= len(starts):
+            return
+        pos = blob.find(kw, starts[i + 1])
+
+
+def _iter_regex_matches(descriptors, pattern):
+    """Helper function to find the descriptor names that match a pattern.
+
+    Parameters
+    ----------
+    descriptors : list
+        Flow descriptors.
+    pattern : re.Pattern
+        A compiled regular expression.
+
+    Yields
+    ------
+    tuple
+        The index of each matching descriptor, in order, and the match rank
+        (see _iter_name_matches).
+    """
+    for i, d in enumerate(descriptors):
+        if not d.name:
+            continue
+        m = pattern.search(d.name)
+        if m is None:
+            continue
+        if m.start():
+            yield i, 2
+        elif m.end() == len(d.name):
+            yield i, 0
+        else:
+            yield i, 1
+
+
+def _name_end(blob, starts, i):
+    """Helper function to get the end offset of a name in the joined
+    name string."""
+    if i + 1 < len(starts):
+        return starts[i + 1] - len(_NAME_SEP)
+    return len(blob)
+
+
+def _bulk_query_flows(client, ids, max_workers=16):
+    """Helper function to query many flows from openLCA.
+
+    The IPC protocol has no multi-id query, so the requests are sent from a
+    thread pool to overlap their round trips.
+
+    Parameters
+    ----------
+    client : NetlOlca
+        The netlolca client instance.
+    ids : list
+        A list of flow UUIDs.
+    max_workers : int, optional
+        The maximum number of concurrent requests; 1 sends them one at a
+        time. Defaults to 16.
+
+    Returns
+    -------
+    list
+        A list of olca.Flow objects in the same order as ``ids``; None for
+        flows that could not be retrieved.
+    """
+    def _query(flow_id):
+        try:
+            return client.query(olca.Flow, flow_id)
+        except Exception as e:
+            logger.warning("Could not retrieve flow %s: %s", flow_id, e)
+            return None
+
+    if len(ids) < 2 or max_workers <= 1:
+        return [_query(flow_id) for flow_id in ids]
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(_query, ids))
+
+
+def _report(verbose, msg, *args):
+    """Helper function to print a status message, or log it when quiet."""
+    if verbose:
+        print(msg % args)
+    else:
+        logger.info(msg, *args)
@@ -6,7 +6,8 @@
 ###############################################################################
 # DEPENDENCIES
 ###############################################################################
-from typing import Optional, Tuple, List
+from types import MappingProxyType
+from typing import Callable, Optional, Tuple, List
 import sys
 import logging
 
@@ -16,12 +17,13 @@ except Exception as e:
     # Don't hard crash on import when reading the file; surface a clearer error
     # later when used.
     olca = None
-import olca_schema.units as o_units
 
 from netlolca import NetlOlca
+from src.create_olca_process._client_cache import _ensure_client, _prompt, _prompt_select
 from src.create_olca_process.flow_search_function import search_Flows_by_keywords
 from src.create_olca_process.find_processes_by_flow import find_processes_by_flow
 from src.create_olca_process.create_exchange_database import create_exchange_database
+from src.create_olca_process.unit_lookup import lookup_property_ref
 
 
 ###############################################################################
@@ -37,7 +39,7 @@ Returns (flow_uuid, process_uuid) as a tuple from :func:`main`.
 
 Relies on:
 
--   NetlOlca.NetlOlca to establish the olca-ipc client
+-   _client_cache._ensure_client to establish the NetlOlca client
 -   flow_search_function.search_Flows_by_keywords(client, keywords, flow_type)
 -   find_processes_by_flow.find_processes_by_flow(client, flow_uuid)
 
@@ -51,25 +53,26 @@ __all__ = [
 
 
 ###############################################################################
-# FUNCTIONS
+# GLOBALS
 ###############################################################################
-def _ensure_client(existing_client=None):
-    """Return a connected olca client. Use the provided one if valid, else
-    connect via NetlOlca."""
-    if existing_client is not None:
-        return existing_client
-    netl = NetlOlca()
-    netl.connect()  # uses default port from NetlOlca
-    if not getattr(netl, "client", None):
-        raise RuntimeError(
-            "Failed to connect to openLCA via IPC. Is openLCA running with "
-            "a database open?"
-        )
-    return netl.client
+_FLOWTYPE_MAP = MappingProxyType({
+    "product": olca.FlowType.PRODUCT_FLOW,
+    "product flow": olca.FlowType.PRODUCT_FLOW,
+    "waste": olca.FlowType.WASTE_FLOW,
+    "waste flow": olca.FlowType.WASTE_FLOW,
+} if olca is not None else {})
+'''mappingproxy : Read-only map of normalized user strings to flow types.'''
 
 
+###############################################################################
+# FUNCTIONS
+###############################################################################
 def _flowtype_from_string(s: str):
     """Map a user string to olca.FlowType.*_FLOW"""
+    # Fast path for strings that are already normalized (e.g., 'product')
+    flow_type = _FLOWTYPE_MAP.get(s)
+    if flow_type is not None:
+        return flow_type
     if olca is None:
         raise ImportError(
             "The 'olca' package is required but could not be imported."
@@ -77,62 +80,9 @@ def _flowtype_from_string(s: str):
     if not s:
         raise ValueError("Flow type string is empty.")
     key = s.strip().lower()
-    mapping = {
-        "product": olca.FlowType.PRODUCT_FLOW,
-        "product flow": olca.FlowType.PRODUCT_FLOW,
-        "waste": olca.FlowType.WASTE_FLOW,
-        "waste flow": olca.FlowType.WASTE_FLOW,
-    }
-    if key not in mapping:
+    if key not in _FLOWTYPE_MAP:
         raise ValueError(f"Unknown flow type '{s}'. Expected one of: product, waste, elementary.")
-    return mapping[key]
-
-
-def _prompt_select(rows: List[dict],
-                   display_keys: List[str],
-                   uuid_key: str,
-                   prompt: str) -> Optional[str]:
-    """Simple CLI selector over a list of dictionaries.
-
-    Parameters
-    ----------
-    rows : list
-        A list of dicts to display.
-    display_keys : list
-        A list of keys to show in each row.
-    uuid_key : str
-        A key that contains the UUID to return.
-    prompt : str
-        Input prompt string.
-
-    Returns
-    -------
-    str, NoneType
-        The selected UUID string, or None if user aborts.
-    """
-    if not rows:
-        print("No options to select from.")
-        return None
-
-    for i, row in enumerate(rows, 1):
-        parts = []
-        for k in display_keys:
-            val = row.get(k, "")
-            parts.append(f"{k}: {val}")
-        print(f"{i:3d}. " + " | ".join(parts))
-
-    while True:
-        choice = input(f"{prompt} (1-{len(rows)} or 'q' to quit): ").strip()
-        if choice.lower() in ("q", "quit", "exit"):
-            return None
-        if not choice.isdigit():
-            print("Please enter a valid number.")
-            continue
-        idx = int(choice)
-        if not (1 <= idx <= len(rows)):
-            print(f"Please enter a number between 1 and {len(rows)}.")
-            continue
-        return rows[idx - 1].get(uuid_key)
+    return _FLOWTYPE_MAP[key]
 
 
 def search_and_select(exchanges_df,
@@ -140,13 +90,16 @@ def search_and_select(exchanges_df,
                       flow_type_str: Optional[str] = None,
                       client=None,
                       unit: Optional[str] = None,
+                      choose: Optional[Callable] = None,
+                      cache_ttl: float = 60.0,
                       ) -> Tuple[Optional[str], Optional[str]]:
     """Search for a flow and (if applicable) a provider process.
 
     Parameters
     ----------
-    exchanges_df : pandas.DataFrame
-        A dataframe containing exchanges.
+    exchanges_df : pandas.DataFrame or FlowIndex
+        A dataframe containing exchanges, or a flow index built from it (see
+        build_flow_index.py).
     keywords : str, optional
         Keyword(s) to search flow names.
         Defaults to none.
@@ -157,6 +110,14 @@ def search_and_select(exchanges_df,
         A pre-connected olca-ipc client.
     unit : str, optional
         Unit name. Defaults to none.
+    choose : callable, optional
+        A function called as ``choose(rows, prompt)`` to select the flow and
+        the provider instead of prompting the user (see
+        _client_cache._prompt_select). When given with keywords, the
+        keywords are used without prompting. Defaults to none.
+    cache_ttl : float, optional
+        How long, in seconds, cached flow search results are reused (see
+        flow_search_function.py). Defaults to 60.
 
     Returns
     -------
@@ -173,15 +134,15 @@ def search_and_select(exchanges_df,
 
     # If no keywords provided, prompt for them
     if keywords is None:
-        keywords = input(
+        keywords = _prompt(
             "Enter flow name keyword(s). Type 'skip' to skip this flow. "
         ).strip()
     elif keywords.lower() == 'skip':
         return ('skip', None)
     # If keywords provided, prompt, but allow user to press enter to use the
-    # default keywords.
-    else:
-        keywords_response = input(
+    # default keywords (no prompt when the selection is scripted).
+    elif choose is None:
+        keywords_response = _prompt(
             "Enter flow name keyword(s). "
             "Type 'skip' to skip this flow. "
             f"Press enter to use {keywords}: "
@@ -202,41 +163,29 @@ def search_and_select(exchanges_df,
     flow_type = _flowtype_from_string(flow_type_str)
 
     # 1) Search for flows by keyword and type
-    results = search_Flows_by_keywords(client, keywords, flow_type)
-    if not results:
-        print("No flows found matching the criteria.")
-        return (None, None)
-
-    # Expect matching_flows (list of olca.Flow), clean_df with ['Number',
-    # 'Flow_Name','UUID'], and full_df; only need clean_df:
-    _, clean_df, _ = results
+    # Returns matching_flows (list of olca.Flow), clean_df with ['Number',
+    # 'Flow_Name','UUID'], and full_df; only need clean_df, which is empty
+    # when nothing matches:
+    _, clean_df, _ = search_Flows_by_keywords(
+        client, keywords, flow_type, cache_ttl=cache_ttl
+    )
 
-    if clean_df is None or len(clean_df) == 0:
+    if clean_df.empty:
         print("No flows found matching the criteria.")
         return (None, None)
 
     # Build rows to display
-    rows = []
-    for _, row in clean_df.iterrows():
-        rows.append({
-            "Number": int(row.get("Number", len(rows)+1)),
-            "Flow_Name": str(row.get("Flow_Name", "")),
-            "UUID": str(row.get("UUID", "")),
-        })
+    rows = clean_df[["Number", "Flow_Name", "UUID"]].to_dict("records")
 
     selected_flow_uuid = None
     selected_flow_uuid = _prompt_select(
         rows, display_keys=["Flow_Name", "UUID"], uuid_key="UUID",
-        prompt="Select a flow"
+        prompt="Select a flow", choose=choose
     )
     if selected_flow_uuid is None:
         return (None, None)
 
-    ids=[]
-    flow = client.query(olca.Flow, selected_flow_uuid)
-    flow_property = o_units.property_ref(unit)
-    if flow_property is None:
-        flow_property = o_units.property_ref(unit.lower())
+    flow_property = lookup_property_ref(unit)
     if flow_property is None:
         raise ValueError(
             "The flow property is not found in the flow. "
@@ -258,20 +207,25 @@ def search_and_select(exchanges_df,
         print("No provider processes found for the selected flow.")
         return (selected_flow_uuid, None)
 
-    proc_rows = []
-    # Expected columns include 'process_name' and 'process_uuid'
-    for _, row in producers_df.iterrows():
-        proc_rows.append({
-            "Process_Name": str(row.get("process_name", "")),
-            "Process_UUID": str(row.get("process_uuid", "")),
+    # Expected columns include 'process_name' and 'process_uuid'; they may
+    # be categorical, so convert them to strings for display
+    proc_rows = (
+        producers_df[["process_name", "process_uuid"]]
+        .astype(str)
+        .rename(columns={
+            "process_name": "Process_Name",
+            "process_uuid": "Process_UUID",
         })
+        .to_dict("records")
+    )
 
     selected_process_uuid = None
     selected_process_uuid = _prompt_select(
         proc_rows,
         display_keys=["Process_Name", "Process_UUID"],
         uuid_key="Process_UUID",
-        prompt="Select a provider process"
+        prompt="Select a provider process",
+        choose=choose
     )
     print(f"Selected process UUID: {selected_process_uuid}")
     if selected_process_uuid is None:
@@ -293,9 +247,11 @@ def main(argv: Optional[List[str]] = None):
             flow_type_str = 'product',
             client = netl
         )
-        print("\nResult:")
-        print(f"Flow UUID    : {flow_uuid}")
-        print(f"Process UUID : {process_uuid}")
+        print(
+            "\nResult:\n"
+            f"Flow UUID    : {flow_uuid}\n"
+            f"Process UUID : {process_uuid}"
+        )
     except Exception as e:
         logging.exception("Error running search_flows: %s", e)
         print(f"Error: {e}")
@@ -6,7 +6,7 @@
 ###############################################################################
 # DEPENDENCIES
 ###############################################################################
-from typing import Optional, List
+from typing import Callable, Optional, List
 import sys
 import logging
 
@@ -18,6 +18,7 @@ except Exception as e:
     olca = None
 
 from netlolca import NetlOlca
+from src.create_olca_process._client_cache import _ensure_client, _prompt, _prompt_select
 from src.create_olca_process.flow_search_function import search_Flows_by_keywords
 from src.create_olca_process.create_exchange_database import create_exchange_database
 
@@ -33,7 +34,7 @@ Interactive search to:
 Returns (flow_uuid, process_uuid) as a tuple from the main function.
 
 Relies on:
-- NetlOlca.NetlOlca to establish the olca-ipc client
+- _client_cache._ensure_client to establish the NetlOlca client
 - flow_search_function.search_Flows_by_keywords(client, keywords, flow_type)
 - find_processes_by_flow.find_processes_by_flow(client, flow_uuid)
 
@@ -50,74 +51,11 @@ __all__ = [
 # FUNCTIONS
 ###############################################################################
 
-# -----------------------------------------------------------------------------
-# Utilities
-# -----------------------------------------------------------------------------
-
-def _ensure_client(existing_client=None):
-    """Return a connected olca client. Use the provided one if valid, else
-    connect via NetlOlca."""
-    if existing_client is not None:
-        return existing_client
-    netl = NetlOlca()
-    netl.connect()  # uses default port from NetlOlca
-    if not getattr(netl, "client", None):
-        raise RuntimeError("Failed to connect to openLCA via IPC. Is openLCA running with a database open?")
-    return netl.client
-
-
-def _prompt_select(rows: List[dict],
-                   display_keys: List[str],
-                   uuid_key: str,
-                   prompt: str) -> Optional[str]:
-    """Simple CLI selector over a list of dictionaries.
-
-    Parameters
-    ----------
-    rows : list
-        A list of dicts to display.
-    display_keys : list
-        A list of keys to show in each row.
-    uuid_key : str
-        A string that contains the UUID to return.
-    prompt : str
-        Input prompt.
-
-    Returns
-    -------
-    str
-        The selected UUID string, or None if user aborts.
-    """
-    if not rows:
-        print("No options to select from.")
-        return None
-
-    for i, row in enumerate(rows, 1):
-        parts = []
-        for k in display_keys:
-            val = row.get(k, "")
-            parts.append(f"{k}: {val}")
-        print(f"{i:3d}. " + " | ".join(parts))
-
-    while True:
-        choice = input(f"{prompt} (1-{len(rows)} or 'q' to quit): ").strip()
-        if choice.lower() in ("q", "quit", "exit"):
-            return None
-        if not choice.isdigit():
-            print("Please enter a valid number.")
-            continue
-        idx = int(choice)
-        if not (1 <= idx <= len(rows)):
-            print(f"Please enter a number between 1 and {len(rows)}.")
-            continue
-        return rows[idx - 1].get(uuid_key)
-
-
 # -----------------------------------------------------------------------------
 # Core functionality
 # -----------------------------------------------------------------------------
 
-def search_and_select_flows(keywords, client):
+def search_and_select_flows(keywords, client, choose: Optional[Callable] = None):
     """Search for a product flow.
 
     Parameters
@@ -126,6 +64,11 @@ def search_and_select_flows(keywords, client):
         A string with keyword(s) to search flow names.
     client : NetlOlca
         An optional pre-connected olca-ipc client.
+    choose : callable, optional
+        A function called as ``choose(rows, prompt)`` to select a flow
+        instead of prompting the user (see _client_cache._prompt_select).
+        When given with keywords, the keywords are used without prompting.
+        Defaults to none.
 
     Returns
     -------
@@ -136,16 +79,16 @@ def search_and_select_flows(keywords, client):
 
     # If no keywords provided, prompt for them
     if keywords is None:
-        keywords = input(
+        keywords = _prompt(
             "Enter flow name keyword(s). "
             "Type 'skip' to skip this flow. "
         ).strip()
     elif keywords.lower() == 'skip':
         return ('skip', None)
     # If keywords provided, prompt, but allow user to press enter to use the
-    # default keywords
-    else:
-        keywords_response = input(
+    # default keywords (no prompt when the selection is scripted)
+    elif choose is None:
+        keywords_response = _prompt(
             "Enter flow name keyword(s). "
             "Type 'skip' to skip this flow. "
             f"Press enter to use {keywords}: ").strip()
@@ -161,36 +104,26 @@ def search_and_select_flows(keywords, client):
         raise ValueError("No keywords provided.")
 
     # 1) Search for flows by keyword -- only report product flows
-    results = search_Flows_by_keywords(
+    # Returns matching_flows (list of olca.Flow), clean_df with ['Number',
+    # 'Flow_Name','UUID'], and full_df; clean_df is empty when nothing matches
+    _, clean_df, _ = search_Flows_by_keywords(
         client, keywords, olca.FlowType.PRODUCT_FLOW
     )
-    if not results:
-        print("No flows found matching the criteria.")
-        return (None, None)
-
-    # Expect: matching_flows (list of olca.Flow), clean_df with ['Number',
-    # 'Flow_Name','UUID'], full_df
-    _, clean_df, _ = results
 
-    if clean_df is None or len(clean_df) == 0:
+    if clean_df.empty:
         print("No flows found matching the criteria.")
         return (None, None)
 
     # Build rows to display
-    rows = []
-    for _, row in clean_df.iterrows():
-        rows.append({
-            "Number": int(row.get("Number", len(rows)+1)),
-            "Flow_Name": str(row.get("Flow_Name", "")),
-            "UUID": str(row.get("UUID", "")),
-        })
+    rows = clean_df[["Number", "Flow_Name", "UUID"]].to_dict("records")
 
     selected_flow_uuid = None
     selected_flow_uuid = _prompt_select(
         rows,
         display_keys=["Flow_Name", "UUID"],
         uuid_key="UUID",
-        prompt="Select a flow"
+        prompt="Select a flow",
+        choose=choose
     )
     if selected_flow_uuid is None:
         return (None, None)
@@ -215,8 +148,7 @@ def main(argv: Optional[List[str]] = None):
             keywords=None,
             client=netl,
         )
-        print("\nResult:")
-        print(f"Flow UUID    : {flow_uuid}")
+        print(f"\nResult:\nFlow UUID    : {flow_uuid}")
     except Exception as e:
         logging.exception("Error running search_flows_only: %s", e)
         print(f"Error: {e}")
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# unit_lookup.py
+#
+###############################################################################
+# DEPENDENCIES
+###############################################################################
+import functools
+
+import olca_schema.units as o_units
+
+
+###############################################################################
+# DOCUMENTATION
+###############################################################################
+__doc__ = """
+This module has functions to look up the openLCA reference flow property and
+unit for a unit name (e.g., 'kg' or 'MJ').
+
+**Logic**
+
+The unit name is looked up as given and, if not found, in lower case (unit
+names are case sensitive, e.g., 'Mg' and 'mg', so the name as given is tried
+first). The results are cached by unit name, because the same few units are
+used by most of the exchanges of a process.
+"""
+__all__ = [
+    "lookup_property_ref",
+    "lookup_unit_ref",
+]
+
+
+###############################################################################
+# FUNCTIONS
+###############################################################################
+def lookup_property_ref(unit):
+    """Get the reference to the flow property of a unit.
+
+    Parameters
+    ----------
+    unit : str
+        Unit name.
+
+    Returns
+    -------
+    olca-schema.Ref
+        A reference to the flow property, or None if the unit is not found.
+    """
+    if not isinstance(unit, str):
+        return o_units.property_ref(unit)
+    return _cached_property_ref(unit)
+
+
+def lookup_unit_ref(unit):
+    """Get the reference to a unit.
+
+    Parameters
+    ----------
+    unit : str
+        Unit name.
+
+    Returns
+    -------
+    olca-schema.Ref
+        A reference to the unit, or None if the unit is not found.
+    """
+    if not isinstance(unit, str):
+        return o_units.unit_ref(unit)
+    return _cached_unit_ref(unit)
+
+
+@functools.lru_cache(maxsize=128)
+def _cached_property_ref(unit):
+    """Helper function to look up a flow property reference by unit name."""
+    flow_property = o_units.property_ref(unit)
+    if flow_property is None:
+        flow_property = o_units.property_ref(unit.lower())
+    return flow_property
+
+
+@functools.lru_cache(maxsize=128)
+def _cached_unit_ref(unit):
+    """Helper function to look up a unit reference by unit name."""
+    unit_ref = o_units.unit_ref(unit)
+    if unit_ref is None:
+        unit_ref = o_units.unit_ref(unit.lower())
+    return unit_ref
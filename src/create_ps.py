@@ -6,6 +6,9 @@
 ###############################################################################
 # DEPENDENCIES
 ###############################################################################
+import functools
+from concurrent.futures import ThreadPoolExecutor
+
 import olca_schema as olca
 
 
@@ -32,16 +35,39 @@ The function takes two main arguments/inputs:
 2.  process_uuid
 
 The function returns a product system object.
+
+The process references are cached per client and process UUID, so building
+several product systems from the same processes (e.g., in a batch run) does
+not query the processes from openLCA again. The cache keeps the most recently
+used references; call :func:`clear_process_ref_cache` after deleting or
+renaming processes in the openLCA database.
+
+To create product systems for several processes, :func:`create_ps_batch`
+queries all of the processes first (from a thread pool, so the IPC round trips
+overlap) and then creates the product systems in order.
 """
 __all__ = [
+    "clear_process_ref_cache",
     "create_ps",
+    "create_ps_batch",
 ]
 
 
+###############################################################################
+# GLOBALS
+###############################################################################
+_DEFAULT_LINKING_CONFIG = olca.LinkingConfig(
+    cutoff=None,
+    prefer_unit_processes=True,
+    provider_linking=olca.ProviderLinking.PREFER_DEFAULTS
+)
+'''olca.LinkingConfig : Provider linking options for new product systems.'''
+
+
 ###############################################################################
 # FUNCTIONS
 ###############################################################################
-def create_ps(client, process_uuid):
+def create_ps(client, process_uuid, linking_config=None):
     """Create a product system in openLCA.
 
     Parameters
@@ -51,22 +77,88 @@ def create_ps(client, process_uuid):
     process_uuid : str
         The universally unique identifier to a process, which will become
         the reference process to the created product system.
+    linking_config : olca-schema.LinkingConfig, optional
+        The provider linking options. Defaults to none, which links to
+        default providers, preferring unit processes, without a cutoff.
 
     Returns
     -------
     olca-schema.Ref
         A reference object to the newly created product system.
     """
+    if linking_config is None:
+        linking_config = _DEFAULT_LINKING_CONFIG
+
     # create product system with name of process
-    process_ref = client.query(olca.Process, process_uuid).to_ref()
-    linking_config = olca.LinkingConfig(
-        cutoff=None,
-        prefer_unit_processes=True,
-        provider_linking=olca.ProviderLinking.PREFER_DEFAULTS
-    )
+    process_ref = _get_process_ref(client, process_uuid)
     product_system_ref = client.client.create_product_system(
         process_ref,
         linking_config
     )
 
     return product_system_ref
+
+
+def create_ps_batch(client, process_uuids, max_workers=8,
+                    linking_config=None):
+    """Create product systems in openLCA for several processes.
+
+    Parameters
+    ----------
+    client : NetlOlca
+        An NetlOlca class instance connected to openLCA via IPC service.
+    process_uuids : list
+        The universally unique identifiers of the processes, each of which
+        will become the reference process to a created product system.
+    max_workers : int, optional
+        The maximum number of concurrent process requests; use 1 to send
+        them one at a time. Defaults to 8.
+    linking_config : olca-schema.LinkingConfig, optional
+        The provider linking options shared by all of the product systems
+        (see :func:`create_ps`). Defaults to none.
+
+    Returns
+    -------
+    list
+        A list of references (olca-schema.Ref) to the newly created product
+        systems, in the same order as ``process_uuids``.
+    """
+    process_uuids = list(process_uuids)
+
+    # Query each process once; the product systems are created one at a
+    # time, because creating them writes to the openLCA database
+    unique_uuids = list(dict.fromkeys(process_uuids))
+    if max_workers <= 1 or len(unique_uuids) < 2:
+        for process_uuid in unique_uuids:
+            _get_process_ref(client, process_uuid)
+    else:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            list(executor.map(
+                lambda process_uuid: _get_process_ref(client, process_uuid),
+                unique_uuids
+            ))
+
+    return [
+        create_ps(client, process_uuid, linking_config=linking_config)
+        for process_uuid in process_uuids
+    ]
+
+
+def clear_process_ref_cache():
+    """Clear the cached process references."""
+    _get_process_ref.cache_clear()
+
+
+@functools.lru_cache(maxsize=256)
+def _get_process_ref(client, process_uuid):
+    """Helper function to get a (cached) reference to a process.
+
+    Only the process descriptor is requested from openLCA, rather than the
+    full process with all of its exchanges. The cache is keyed by the client
+    itself (not its id), so a new client never gets another client's
+    references; processes that are not found are not cached.
+    """
+    process_ref = client.client.get_descriptor(olca.Process, process_uuid)
+    if process_ref is None:
+        raise ValueError(f"Process not found: {process_uuid}")
+    return process_ref
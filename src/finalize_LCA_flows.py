@@ -10,6 +10,13 @@ import pandas as pd
 from typing import Union, List
 import fedelemflowlist as ffl
 
+# PyArrow is optional; it is only used to speed up reading the CSV file
+try:
+    import pyarrow  # noqa: F401
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
 
 ###############################################################################
 # DOCUMENTATION
@@ -109,15 +116,17 @@ context_mapping = {
 }
 '''dict : For mapping elementary flow compartments to openLCA contexts'''
 
+categorical_columns = ['Source', 'Flow', 'In/Out', 'Category']
+'''list : Text columns read as pandas categoricals, so that comparing and
+grouping them works on integer codes rather than strings.'''
+
 
 ###############################################################################
 # FUNCTIONS
 ###############################################################################
-def _merge_values(df: pd.DataFrame,
-                  source: str,
+def _merge_values(matching_flows: pd.DataFrame,
                   value_column: str,
-                  merge_logic: Union[str, List[str]],
-                  merge_column: str = 'Source') -> float:
+                  merge_logic: Union[str, List[str]]) -> float:
     """
     Helper function to merge values based on the specified logic.
 
@@ -128,10 +137,8 @@ def _merge_values(df: pd.DataFrame,
 
     Parameters
     ----------
-    df : pandas.DataFrame
-        DataFrame containing the flows
-    source : str
-        Source value to match in the merge_column
+    matching_flows : pandas.DataFrame
+        DataFrame containing only the flows that share the merge source
     value_column : str
         Column name containing the values to merge ('Value 1', 'Value 2', or 'LCA Amount')
     merge_logic : str or list
@@ -140,8 +147,6 @@ def _merge_values(df: pd.DataFrame,
         - "same": Keep the value from the first matching flow
         - "total": Sum all values from matching flows
         - list: Sum values from flows with names in the list
-    merge_column : str, optional
-        Column name to use for matching flows (default: 'Source')
 
     Returns
     -------
@@ -153,11 +158,9 @@ def _merge_values(df: pd.DataFrame,
     If merge_logic is a list, only flows with names in that list are included in the sum.
     If merge_logic is not recognized, defaults to "same" behavior.
     """
-    matching_flows = df[df[merge_column] == source]
-
     if merge_logic == "same":
         # Return the value from the first matching flow
-        return matching_flows.iloc[0][value_column]
+        return matching_flows[value_column].iat[0]
 
     elif merge_logic == "total":
         # Sum all values from matching flows
@@ -170,38 +173,35 @@ def _merge_values(df: pd.DataFrame,
 
     else:
         # Default to "same" behavior
-        return matching_flows.iloc[0][value_column]
+        return matching_flows[value_column].iat[0]
 
 
 def _get_flows_to_delete(df: pd.DataFrame,
-                        source: str,
-                        delete_logic: Union[str, List[str]],
-                        merge_column: str = 'Source') -> List[int]:
+                        matching_mask: pd.Series,
+                        delete_logic: Union[str, List[str]]) -> pd.Series:
     """
     Helper function to determine which flows should be deleted after merging.
 
-    This function identifies the indices of flows that should be removed from the
-    DataFrame based on the deletion logic. It supports deleting all matching flows
-    or only specific flows by name.
+    This function marks the flows that should be removed from the DataFrame
+    based on the deletion logic. It supports deleting all matching flows or
+    only specific flows by name.
 
     Parameters
     ----------
     df : pandas.DataFrame
-        DataFrame containing the flows
-    source : str
-        Source value to match in the merge_column
+        DataFrame containing all flows
+    matching_mask : pandas.Series
+        Boolean mask of the flows in df that share the merge source
     delete_logic : str or list
         Logic for determining deletions:
         - "all": Delete all flows with matching source
         - list: Delete flows with names in the list that have matching source
         - other: Don't delete any flows
-    merge_column : str, optional
-        Column name to use for matching flows (default: 'Source')
 
     Returns
     -------
-    list
-        List of DataFrame indices to delete
+    pandas.Series
+        Boolean mask of the flows in df to delete
 
     Notes
     -----
@@ -209,22 +209,17 @@ def _get_flows_to_delete(df: pd.DataFrame,
     source are marked for deletion. If delete_logic is anything other than
     "all" or a list, no flows are deleted.
     """
-    matching_flows = df[df[merge_column] == source]
-
     if delete_logic == "all":
         # Delete all flows with matching source
-        return matching_flows.index.tolist()
+        return matching_mask
 
     elif isinstance(delete_logic, list):
         # Delete flows with names in the list that have matching source
-        flows_to_delete = matching_flows[
-            matching_flows['Flow'].isin(delete_logic)
-        ]
-        return flows_to_delete.index.tolist()
+        return matching_mask & df['Flow'].isin(delete_logic)
 
     else:
         # Don't delete any flows
-        return []
+        return pd.Series(False, index=df.index)
 
 
 def _insert_flow_at_position(df: pd.DataFrame,
@@ -234,9 +229,9 @@ def _insert_flow_at_position(df: pd.DataFrame,
     Helper function to insert a new flow at a specific position in the
     DataFrame.
 
-    This function converts the DataFrame to a list of dictionaries, inserts the
-    new flow at the specified position, and converts back to a DataFrame. This
-    approach preserves the order of flows while maintaining all column data.
+    This function concatenates the rows before the position, the new flow,
+    and the rows after the position. This approach preserves the order of
+    flows while maintaining all column data.
 
     Parameters
     ----------
@@ -254,19 +249,33 @@ def _insert_flow_at_position(df: pd.DataFrame,
 
     Notes
     -----
-    The function temporarily converts the DataFrame to a list of dictionaries
-    for insertion, then converts back. This ensures the new flow is placed
-    exactly at the specified position while preserving all other flows and
-    their order.
+    The position is a row position (not an index label), and the returned
+    DataFrame has a new default index. The rows are copied as column blocks,
+    rather than converted to a list of dictionaries and back.
     """
-    # Convert to list for easier manipulation
-    df_list = df.to_dict('records')
+    # Build a one-row DataFrame, so each column of the new flow gets its own
+    # data type (a row Series holds mixed values as objects)
+    new_row = pd.DataFrame([new_flow.to_dict()])
+
+    # Slice around the new flow; empty slices are left out so they do not
+    # affect the column data types
+    pieces = [df.iloc[:position], new_row, df.iloc[position:]]
+    inserted = pd.concat(
+        [piece for piece in pieces if len(piece)], ignore_index=True
+    )
 
-    # Insert the new flow at the specified position
-    df_list.insert(position, new_flow.to_dict())
+    # Concatenating a categorical column with the new flow's values gives an
+    # object column; keep the categorical columns categorical
+    restore = {
+        column: 'category'
+        for column, dtype in df.dtypes.items()
+        if isinstance(dtype, pd.CategoricalDtype)
+        and not isinstance(inserted[column].dtype, pd.CategoricalDtype)
+    }
+    if restore:
+        inserted = inserted.astype(restore)
 
-    # Convert back to DataFrame
-    return pd.DataFrame(df_list)
+    return inserted
 
 
 def main(reference_flow: str = '73.4% REO Product',
@@ -306,7 +315,11 @@ def main(reference_flow: str = '73.4% REO Product',
     though the original study used 357 ppm. Some wastewater streams are organic
     waste but are treated as wastewater for consistency.
     """
-    df = pd.read_csv('output/lca_df_converted.csv')
+    # With PyArrow, the file is parsed by Arrow's multithreaded CSV reader;
+    # the columns keep the default (NumPy) data types either way
+    read_kwargs = {'engine': 'pyarrow'} if PYARROW_AVAILABLE else {}
+    df = pd.read_csv('output/lca_df_converted.csv', **read_kwargs)
+    df = df.astype(dict.fromkeys(categorical_columns, 'category'))
 
     # Run the merge_flows function for the feed
     REO_list = [
@@ -366,14 +379,18 @@ def main(reference_flow: str = '73.4% REO Product',
 
         # Get summary.
         summary = get_finalize_summary(finalized_df)
-        print("Summary:")
-        for key, value in summary.items():
-            if key != 'flow_type_breakdown':
-                print(f"  {key}: {value}")
-
-        print("\nFlow Type Breakdown:")
-        for flow_type, count in summary['flow_type_breakdown'].items():
-            print(f"  {flow_type}: {count}")
+        lines = ["Summary:"]
+        lines.extend(
+            f"  {key}: {value}"
+            for key, value in summary.items()
+            if key != 'flow_type_breakdown'
+        )
+        lines.append("\nFlow Type Breakdown:")
+        lines.extend(
+            f"  {flow_type}: {count}"
+            for flow_type, count in summary['flow_type_breakdown'].items()
+        )
+        print("\n".join(lines))
 
     except Exception as e:
         print(f"Error during finalization: {e}")
@@ -426,88 +443,80 @@ def finalize_df(df: pd.DataFrame,
         df, reference_flow, reference_source
     )
 
-    # Step 2: Create new DataFrame with required columns
-    finalized_data = []
-
-    for _, row in df_functional.iterrows():
-        # Required columns
-        flow_name = row['Flow']
-        lca_amount = row['LCA Amount']
-        lca_unit = row['LCA Unit']
-
-        # Optional columns
-        is_input = row['In/Out'].lower() == 'in'
-        reference_product = (row['Flow'] == reference_flow and
-                           row['Source'] == reference_source)
-        flow_type = row['Category']
-
-        # If it is water, we can mention the water type. Otherwise, the
-        # description is blank.
-        description = ''
-        if flow_type == 'Water':
-            try:
-                description = f'{water_type}'
-            except:
-                print(f'Error getting water type {water_type}: {e}')
-                description = ''
-
-        # Map the flow type to the openLCA category if it exists in the
-        # category_mapping dictionary.
-        lower_flow_type = flow_type.lower()
-        if lower_flow_type in category_mapping.keys():
-            category = category_mapping[lower_flow_type]
-        else:
-            category = flow_type
-
-        # Can only generate these for elementary flows. Otherwise, they will be
-        # left empty strings.
-        context = ''
-        uuid = ''
-        if category == 'Elementary flows':
-            # So we only define elem_df once:
-            try:
-                elem_df = elem_df
-            except:
-                elem_df = ffl.get_flows()
+    # Step 2: Create new DataFrame with required columns; the columns are
+    # built whole rather than one row at a time
+    df_functional = df_functional.reset_index(drop=True)
+    # The finalized columns are plain text (not categoricals), because flows
+    # are renamed below (e.g., Heat to Natural Gas)
+    flow_names = df_functional['Flow'].astype(object)
+    flow_types = df_functional['Category'].astype(object)
+    lower_flow_types = flow_types.str.lower()
+
+    # Map the flow type to the openLCA category if it exists in the
+    # category_mapping dictionary.
+    categories = lower_flow_types.map(category_mapping).fillna(flow_types)
+
+    # Mark the reference product by comparing the raw (object) arrays, which
+    # skips the index alignment of Series operations
+    reference_product = (
+        (flow_names.to_numpy() == reference_flow)
+        & (df_functional['Source'].to_numpy(dtype=object) == reference_source)
+    )
 
-            try:
-                lower_flow_type = flow_type.lower()
-                context = context_mapping[lower_flow_type]
-                uuid = get_uuid(flow_name, context, elem_df)
+    finalized_df = pd.DataFrame({
+        'Flow_Name': flow_names,
+        'LCA_Amount': df_functional['LCA Amount'],
+        'LCA_Unit': df_functional['LCA Unit'],
+        'Is_Input': df_functional['In/Out'].str.lower() == 'in',
+        'Reference_Product': reference_product,
+        'Flow_Type': flow_types,
+        'Category': categories,
+        'Context': '',
+        'UUID': '',
+        'Description': '',
+    })
+
+    # If it is water, we can mention the water type. Otherwise, the
+    # description is blank.
+    finalized_df.loc[flow_types == 'Water', 'Description'] = f'{water_type}'
+
+    # Can only generate these for elementary flows. Otherwise, they will be
+    # left empty strings.
+    elementary = categories == 'Elementary flows'
+    if elementary.any():
+        # So we only define elem_df once:
+        elem_df = ffl.get_flows()
+        contexts = lower_flow_types.map(context_mapping)
+        for idx in finalized_df.index[elementary]:
+            flow_name = flow_names.at[idx]
+            context = contexts.at[idx]
 
             # We won't be able to generate a UUID if the context cannot be
             # generated
-            except KeyError:
+            if pd.isna(context):
                 print(
-                    f'{flow_type} not found in context_mapping. '
+                    f'{flow_types.at[idx]} not found in context_mapping. '
                     f'Cannot generate context or UUID for {flow_name}.'
                 )
+                continue
 
+            finalized_df.at[idx, 'Context'] = context
+            try:
+                finalized_df.at[idx, 'UUID'] = get_uuid(
+                    flow_name, context, elem_df
+                )
             except Exception as e:
                 print(f'Error generating UUID for {flow_name}: {e}')
 
-        # Convert Heat flows to Natural Gas flows
-        if flow_type == "Heat" or flow_name == "Heat":
-            flow_name = "Natural Gas"
-            flow_type = "Heat"
-            lca_unit = "m3"
-            lca_amount = lca_amount / 37.3
-
-        finalized_data.append({
-            'Flow_Name': flow_name,
-            'LCA_Amount': lca_amount,
-            'LCA_Unit': lca_unit,
-            'Is_Input': is_input,
-            'Reference_Product': reference_product,
-            'Flow_Type': flow_type,
-            'Category': category,
-            'Context': context,
-            'UUID': uuid,
-            'Description': description,
-        })
-
-    # Create the new DataFrame
-    finalized_df = pd.DataFrame(finalized_data)
+    # Convert Heat flows to Natural Gas flows
+    heat = (flow_types == 'Heat') | (flow_names == 'Heat')
+    if heat.any():
+        finalized_df.loc[heat, 'Flow_Name'] = 'Natural Gas'
+        finalized_df.loc[heat, 'Flow_Type'] = 'Heat'
+        finalized_df.loc[heat, 'LCA_Unit'] = 'm3'
+        finalized_df.loc[heat, 'LCA_Amount'] = (
+            finalized_df.loc[heat, 'LCA_Amount'] / 37.3
+        )
 
     # Step 3: Merge duplicate flows
     finalized_df = merge_duplicate_flows(finalized_df)
@@ -562,16 +571,17 @@ def merge_flows(df: pd.DataFrame,
     pandas.DataFrame
         DataFrame with merged flows and deletions applied
     """
-    # Create a copy to avoid modifying the original
-    df_copy = df.copy()
+    # The original is not modified: flows are dropped and inserted into new
+    # DataFrames, so it is not copied up front.
 
-    # Find all flows with matching source
-    matching_mask = df_copy[merge_column] == merge_source
-    matching_flows = df_copy[matching_mask]
+    # Find all flows with matching source; the helpers below work on these
+    # rows, so the column is compared only once
+    matching_mask = df[merge_column] == merge_source
+    matching_flows = df[matching_mask]
 
     if matching_flows.empty:
         print(f"Warning: No flows found with {merge_column} '{merge_source}'")
-        return df_copy
+        return df.copy()
 
     # Get the first matching flow as template
     first_flow = matching_flows.iloc[0]
@@ -583,42 +593,42 @@ def merge_flows(df: pd.DataFrame,
 
     # Handle Value 1 merging
     new_flow['Value 1'] = _merge_values(
-        df_copy, merge_source, 'Value 1', value_1_merge, merge_column
+        matching_flows, 'Value 1', value_1_merge
     )
 
     # Handle Value 2 merging
     new_flow['Value 2'] = _merge_values(
-        df_copy, merge_source, 'Value 2', value_2_merge, merge_column
+        matching_flows, 'Value 2', value_2_merge
     )
 
     # Handle LCA Amount merging (if LCA Amount column exists)
-    if 'LCA Amount' in df_copy.columns:
+    if 'LCA Amount' in df.columns:
         new_flow['LCA Amount'] = _merge_values(
-            df_copy, merge_source, 'LCA Amount', LCA_amount_merge, merge_column
+            matching_flows, 'LCA Amount', LCA_amount_merge
         )
 
     # Determine which flows to delete
-    flows_to_delete = _get_flows_to_delete(
-        df_copy, merge_source, delete, merge_column
-    )
-
-    # Delete specified flows
-    if flows_to_delete:
-        df_copy = df_copy.drop(flows_to_delete)
-        # Adjust insert index if the first flow was deleted
-        if insert_index in flows_to_delete:
+    delete_mask = _get_flows_to_delete(df, matching_mask, delete)
+
+    # Delete specified flows; the rows are selected with the mask, rather
+    # than dropped by index label
+    if delete_mask.any():
+        # Adjust insert index if the first flow was deleted (it is the first
+        # matching flow, so it is deleted if the first marked flow is)
+        if delete_mask.idxmax() == insert_index:
             # Find the new position where the first flow was
-            remaining_flows = df_copy[df_copy[merge_column] == merge_source]
-            if not remaining_flows.empty:
-                insert_index = remaining_flows.index[0]
+            remaining_index = df.index[matching_mask & ~delete_mask]
+            if len(remaining_index):
+                insert_index = remaining_index[0]
             else:
                 # If no matching flows remain, insert at the end
-                insert_index = len(df_copy)
+                insert_index = int((~delete_mask).sum())
+        df = df[~delete_mask]
 
     # Insert the new flow at the appropriate position
-    df_copy = _insert_flow_at_position(df_copy, new_flow, insert_index)
+    df = _insert_flow_at_position(df, new_flow, insert_index)
 
-    return df_copy
+    return df
 
 
 def convert_to_functional_unit(df: pd.DataFrame,
@@ -656,38 +666,45 @@ def convert_to_functional_unit(df: pd.DataFrame,
     If multiple flows match the reference criteria, a warning is printed and
     the first match is used. The scaling factor is applied to both 'Value 1'
     and 'LCA Amount' columns.
+    The returned DataFrame is a shallow copy with new 'Value 1' and
+    'LCA Amount' columns; its other columns share their data with the input
+    DataFrame.
     """
-    # Create a copy to avoid modifying the original
-    df_copy = df.copy()
+    # Create a copy to avoid modifying the original. Only the scaled columns
+    # change, and they are replaced with new arrays below, so the copy shares
+    # the data of the other columns.
+    df_copy = df.copy(deep=False)
 
     # Find the reference flow
     reference_mask = (
         df_copy['Flow'] == flow_name) & (df_copy['Source'] == flow_source)
-    reference_flows = df_copy[reference_mask]
+    reference_amounts = df_copy.loc[reference_mask, 'LCA Amount']
 
-    if reference_flows.empty:
+    if reference_amounts.empty:
         raise ValueError(
             f"No flow found with name '{flow_name}' and source "
             f"'{flow_source}'"
         )
 
-    if len(reference_flows) > 1:
+    if len(reference_amounts) > 1:
         print(
             f"Warning: Multiple flows found with name '{flow_name}' and "
             f"source '{flow_source}'. Using the first one."
         )
 
-    # Get the scaling factor from the reference flow
-    scaling_factor = reference_flows.iloc[0]['LCA Amount']
+    # Get the scaling factor from the reference flow; only its LCA Amount is
+    # read, rather than the whole row
+    scaling_factor = float(reference_amounts.iat[0])
 
     if scaling_factor == 0:
         raise ValueError(
             "Reference flow has Value 1 of 0, cannot use as scaling factor"
         )
 
-    # Apply the scaling factor to all Value 1 values
-    df_copy['Value 1'] = df_copy['Value 1'] / scaling_factor
-    df_copy['LCA Amount'] = df_copy['LCA Amount'] / scaling_factor
+    # Apply the scaling factor to all Value 1 and LCA Amount values; each
+    # column is replaced (not written in place), so df is not modified
+    for column in ['Value 1', 'LCA Amount']:
+        df_copy[column] = df_copy[column] / scaling_factor
 
     print(
         "Applied functional unit conversion with scaling factor: "
@@ -763,41 +780,28 @@ def merge_duplicate_flows(df: pd.DataFrame) -> pd.DataFrame:
     """
     # Group by the key columns for merging
     group_columns = ['Flow_Name', 'Flow_Type', 'Is_Input']
+    columns = [
+        'Flow_Name', 'LCA_Amount', 'LCA_Unit', 'Is_Input', 'Reference_Product',
+        'Flow_Type', 'Category', 'Context', 'UUID', 'Description',
+    ]
 
-    # Create a list to store the merged data
-    merged_data = []
-
-    # Group the DataFrame
-    grouped = df.groupby(group_columns)
-
-    for (flow_name, flow_type, is_input), group in grouped:
-        # Sum the LCA_Amount values
-        total_amount = group['LCA_Amount'].sum()
-
-        # Take the first occurrence for other columns (they should be the same)
-        first_row = group.iloc[0]
-
-        # Check if any flow in the group is a reference product
-        is_reference_product = group['Reference_Product'].any()
+    # Like groupby, leave out rows with a missing key
+    df = df[df[group_columns].notna().all(axis=1)]
 
-        # Create the merged row
-        merged_row = {
-            'Flow_Name': flow_name,
-            'LCA_Amount': total_amount,
-            'LCA_Unit': first_row['LCA_Unit'],
-            'Is_Input': is_input,
-            'Reference_Product': is_reference_product,
-            'Flow_Type': flow_type,
-            'Category': first_row['Category'],
-            'Context': first_row['Context'],
-            'UUID': first_row['UUID'],
-            'Description': first_row['Description'],
-        }
+    # Take the first occurrence for other columns (they should be the same)
+    first = ~df.duplicated(group_columns)
 
-        merged_data.append(merged_row)
+    # Sum the LCA_Amount values and check if any flow in the group is a
+    # reference product, for all groups at once
+    grouped = df.groupby(group_columns, sort=False)
+    merged_df = df.loc[first, columns].copy()
+    merged_df['LCA_Amount'] = grouped['LCA_Amount'].transform('sum')[first]
+    merged_df['Reference_Product'] = (
+        grouped['Reference_Product'].transform('any')[first]
+    )
 
-    # Create the new DataFrame
-    merged_df = pd.DataFrame(merged_data)
+    # Order the groups by their keys, as the grouped loop did
+    merged_df = merged_df.sort_values(group_columns)
 
     # Sort by Flow_Name for better readability
     merged_df = merged_df.sort_values('Flow_Name').reset_index(drop=True)
@@ -915,7 +919,7 @@ def validate_finalize_parameters(df: pd.DataFrame,
     # Check if reference flow exists
     reference_mask = (
         df['Flow'] == reference_flow) & (df['Source'] == reference_source)
-    if not df[reference_mask].any().any():
+    if not reference_mask.any():
         print(f"Error: Reference flow '{reference_flow}' from '{reference_source}' not found")
         return False
 
@@ -956,11 +960,13 @@ def get_finalize_summary(df: pd.DataFrame) -> dict:
     The summary provides both numerical counts and categorical breakdowns to
     help understand the distribution and characteristics of the LCA flows.
     """
+    # Count the flows by summing boolean masks, rather than filtering the
+    # whole DataFrame for each count
     summary = {
         'total_flows': len(df),
-        'input_flows': len(df[df['Is_Input'] == True]),
-        'output_flows': len(df[df['Is_Input'] == False]),
-        'reference_products': len(df[df['Reference_Product'] == True]),
+        'input_flows': int(df['Is_Input'].eq(True).sum()),
+        'output_flows': int(df['Is_Input'].eq(False).sum()),
+        'reference_products': int(df['Reference_Product'].eq(True).sum()),
         'unique_flow_types': df['Flow_Type'].nunique(),
         'total_lca_amount': df['LCA_Amount'].sum()
     }
@@ -29,6 +29,12 @@ __all__ = [
 ]
 
 
+###############################################################################
+# GLOBALS
+###############################################################################
+logger = logging.getLogger(__name__)
+
+
 ###############################################################################
 # FUNCTIONS
 ###############################################################################
@@ -85,14 +91,14 @@ def download_edx(resource_id, api_key, output_dir):
     url = 'https://edx.netl.doe.gov/api/3/resource_download'
 
     # Get filename from headers.
-    logging.info("Sending request to EDX for resource data...")
+    logger.info("Sending request to EDX for resource data...")
     response_head = requests.head(url, headers=headers, params=params)
     if response_head.status_code != 200:
-        err_str = (
-            f"Failed to get EDX {resource_id} resource data. "
-            f"Status code: {response_head.status_code}. "
+        logger.error(
+            "Failed to get EDX %s resource data. Status code: %s.",
+            resource_id,
+            response_head.status_code
         )
-        logging.error(err_str)
         return (False, None)
 
     # Set the filename from the Content-Disposition header if available
@@ -105,8 +111,8 @@ def download_edx(resource_id, api_key, output_dir):
     content_length = response_head.headers.get('Content-Length')
     resource_size = int(content_length) if content_length is not None else None
 
-    logging.debug("Resource Name:", filename)
-    logging.debug(f"Resource Size: {resource_size} bytes")
+    logger.debug("Resource Name: %s", filename)
+    logger.debug("Resource Size: %s bytes", resource_size)
 
     # HOTFIX: assign the output directory
     if filename is not None and check_output_dir(output_dir):
@@ -116,36 +122,34 @@ def download_edx(resource_id, api_key, output_dir):
     existing_size = 0
     if os.path.exists(filename):
         existing_size = os.path.getsize(filename)
-        logging.warning(
-            "File already exists. "
-            f"The current file size is: {existing_size} bytes."
+        logger.warning(
+            "File already exists. The current file size is: %d bytes.",
+            existing_size
         )
 
         if resource_size is not None:
-            logging.info(f"Resource file size: {resource_size} bytes")
+            logger.info("Resource file size: %d bytes", resource_size)
             if existing_size >= resource_size:
-                logging.info(
-                    f"File already fully downloaded in {output_dir}."
-                )
+                logger.info("File already fully downloaded in %s.", output_dir)
                 return (True, os.path.basename(filename))
 
         headers['Range'] = f'bytes={existing_size}-'
-        logging.info(f"Resuming download from byte: {existing_size}")
+        logger.info("Resuming download from byte: %d", existing_size)
     else:
-        logging.info(f"Starting download for: {filename}")
+        logger.info("Starting download for: %s", filename)
 
     # Begin download stream
-    logging.debug(" ".join([str(headers), url]))
+    logger.debug("%s %s", headers, url)
     response = requests.get(url, headers=headers, params=params, stream=True)
 
-    logging.debug(f"Download response status code: {response.status_code}")
+    logger.debug("Download response status code: %s", response.status_code)
     if response.status_code in (200, 206):
         # If the server returns a 206 (for partial content), use 'ab' mode to
         # append
         mode = 'ab' if response.status_code == 206 else 'wb'
         total_bytes = existing_size
 
-        logging.info(f"Saving to: {os.path.abspath(filename)}")
+        logger.info("Saving to: %s", os.path.abspath(filename))
         with open(filename, mode) as f:
             for chunk in response.iter_content(chunk_size=8192):
                 if chunk:
@@ -169,14 +173,14 @@ def download_edx(resource_id, api_key, output_dir):
                         )
 
         print(f"\nDownload complete.")
-        logging.debug(f"Total bytes downloaded: {total_bytes}")
+        logger.debug("Total bytes downloaded: %d", total_bytes)
         return (True, os.path.basename(filename))
     else:
-        logging.error(f"Download Failed. Status code: {response.status_code}")
+        logger.error("Download Failed. Status code: %s", response.status_code)
         try:
-            logging.debug("Response:", response.json())
+            logger.debug("Response: %s", response.json())
         except Exception:
-            logging.debug("Non-JSON response:", response.text)
+            logger.debug("Non-JSON response: %s", response.text)
         finally:
             return (False, None)
 
@@ -201,15 +205,15 @@ def check_output_dir(out_dir):
             # Start with super mkdir
             os.makedirs(out_dir)
         except:
-            logging.warning("Failed to create folder %s!" % out_dir)
+            logger.warning("Failed to create folder %s!", out_dir)
             try:
                 # Revert to simple mkdir
                 os.mkdir(out_dir)
             except:
-                logging.error("Could not create folder, %s" % out_dir)
+                logger.error("Could not create folder, %s", out_dir)
             else:
-                logging.info("Created %s" % out_dir)
+                logger.info("Created %s", out_dir)
         else:
-            logging.info("Created %s" % out_dir)
+            logger.info("Created %s", out_dir)
 
     return os.path.isdir(out_dir)
@@ -6,6 +6,8 @@
 ###############################################################################
 # DEPENDENCIES
 ###############################################################################
+import functools
+
 import pandas as pd
 from pyomo.environ import units
 from pyomo.environ import value
@@ -262,40 +264,54 @@ def convert_flows_to_lca_units(df, hours=1, mol_to_kg=True, water_unit='m3'):
     lca_amounts = []
     lca_units = []
 
+    # Most rows share a few unit strings (e.g., 'kg/hr'), so each unit string
+    # is parsed once and the Pyomo unit expression is reused for later rows
+    parsed_units = {}
+
+    def _parse_unit(unit_str):
+        if unit_str not in parsed_units:
+            parsed_units[unit_str] = parse_unit_to_pyomo(unit_str)
+        return parsed_units[unit_str]
+
     # Main processing loop: Convert each flow to LCA-relevant units
     # This loop handles unit parsing, value conversion, and category-based unit selection
-    for idx, row in df.iterrows():
-        unit1 = str(row['Unit 1']).strip()
-        unit2 = str(row['Unit 2']).strip()
+    # Rows are read as plain tuples of the columns used (iterrows builds a
+    # Series for every row)
+    columns = ['Flow', 'Category', 'Value 1', 'Unit 1', 'Value 2', 'Unit 2']
+    rows = zip(df.index, df[columns].itertuples(index=False, name=None))
+    for idx, row in rows:
+        flow, flow_category, raw_value1, raw_unit1, raw_value2, raw_unit2 = row
+        unit1 = str(raw_unit1).strip()
+        unit2 = str(raw_unit2).strip()
 
         # Parse and validate input values, handling special cases and data types
         # This section ensures robust handling of various input formats and
         # edge cases
         try:
-            value1 = float(row['Value 1']) if pd.notna(row['Value 1']) else 0.0
+            value1 = float(raw_value1) if pd.notna(raw_value1) else 0.0
         except (ValueError, TypeError):
             value1 = 0.0
 
         try:
-            if (pd.isna(row['Value 2'])
-                    or row['Value 2'] == ''
-                    or str(row['Value 2']).strip() == ''):
+            if (pd.isna(raw_value2)
+                    or raw_value2 == ''
+                    or str(raw_value2).strip() == ''):
                 value2 = None
             else:
-                value2_str = str(row['Value 2'])
+                value2_str = str(raw_value2)
                 # Handle special case where value contains "*mg/l" format
                 if ('*mg/l' in value2_str.lower()
                         or '*mg/L' in value2_str.lower()):
                     # Extract the numeric part before the asterisk
                     value2 = float(value2_str.split('*')[0])
                 else:
-                    value2 = float(row['Value 2'])
+                    value2 = float(raw_value2)
         except (ValueError, TypeError):
             value2 = None
 
         # Parse units and create Pyomo unit expressions for mathematical
         # operations. This enables unit-aware calculations and conversions.
-        pyomo_unit1 = parse_unit_to_pyomo(unit1)
+        pyomo_unit1 = _parse_unit(unit1)
         if pyomo_unit1 is None:
             # If no valid unit, skip this row or use a default
             lca_amounts.append(0)
@@ -317,7 +333,7 @@ def convert_flows_to_lca_units(df, hours=1, mol_to_kg=True, water_unit='m3'):
                 expression = expression * value2
             else:
                 # Add Value 2 * Unit 2 if applicable
-                pyomo_unit2 = parse_unit_to_pyomo(unit2)
+                pyomo_unit2 = _parse_unit(unit2)
                 if pyomo_unit2 is not None and isinstance(value2, (int, float)):
                     expression = expression * value2 * pyomo_unit2
                 else:
@@ -329,7 +345,7 @@ def convert_flows_to_lca_units(df, hours=1, mol_to_kg=True, water_unit='m3'):
 
         # Determine target unit based on category and unit types
         # This ensures consistent LCA units across different flow categories
-        category = str(row['Category']).lower()
+        category = str(flow_category).lower()
 
         # Water and wastewater should be kg if a concentration is given
         # Otherwise, they should be L
@@ -381,7 +397,7 @@ def convert_flows_to_lca_units(df, hours=1, mol_to_kg=True, water_unit='m3'):
             # Convert molar flows to mass using molecular weights from PubChem
             # This enables consistent mass-based LCA analysis
             elif 'mol' in unit1.lower() and mol_to_kg:
-                molar_mass = get_molar_mass(row['Flow'])
+                molar_mass = get_molar_mass(flow)
                 if molar_mass is not None:
                     # Molar mass is in g/mol, so we need to convert to kg/mol
                     # by dividing by 1000.
@@ -635,23 +651,8 @@ def get_unit(string, default=None):
     'kg'
 
     """
-    unit_str = string.strip()
-    try:
-        unit_str = unit_str.replace('^', '**')
-        new_unit = getattr(units, unit_str, None)
-        if new_unit == None:
-            for index, char in enumerate(unit_str):
-                if char.isdigit():
-                    unit_str = unit_str[:index] + '**' + unit_str[index:]
-                    new_unit = getattr(units, unit_str, None)
-                    continue
-            if new_unit == None:
-                unit_str = unit_str.lower()
-                new_unit = getattr(units, unit_str, None)
-                if new_unit == None:
-                    raise AttributeError
-        return new_unit
-    except AttributeError:
+    new_unit = _resolve_unit(string.strip())
+    if new_unit is None:
         print(f'Error parsing unit string {string}.')
         print(f'Ignoring this unit and returning {default}.')
         print(
@@ -659,6 +660,38 @@ def get_unit(string, default=None):
             'capitalization and exponents, and that there are no parentheses.'
         )
         return default
+    return new_unit
+
+
+@functools.lru_cache(maxsize=256)
+def _resolve_unit(unit_str):
+    """Helper function to look up a unit string in the Pyomo units.
+
+    The same few unit strings (e.g., 'kg', 'hr', 'L') appear in most rows of
+    a flowsheet, so the lookups are cached by unit string.
+
+    Parameters
+    ----------
+    unit_str : str
+        Stripped unit string (e.g., 'kg', 'm3', 'm^3').
+
+    Returns
+    -------
+    pyomo.environ.units.Unit or None
+        Pyomo unit object, or None if the unit is not recognized.
+    """
+    unit_str = unit_str.replace('^', '**')
+    new_unit = getattr(units, unit_str, None)
+    if new_unit is None:
+        for index, char in enumerate(unit_str):
+            if char.isdigit():
+                unit_str = unit_str[:index] + '**' + unit_str[index:]
+                new_unit = getattr(units, unit_str, None)
+                continue
+        if new_unit is None:
+            unit_str = unit_str.lower()
+            new_unit = getattr(units, unit_str, None)
+    return new_unit
 
 
 ###############################################################################